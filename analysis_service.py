@@ -0,0 +1,291 @@
+"""
+HTTP service around the analysis pipeline: POST a workbook, get the
+generate_statistics JSON back.
+
+    python analysis_service.py --port 8600 --workers 4
+    curl --data-binary @registrations.xlsx http://localhost:8600/analyze
+
+- POST /analyze with the workbook as the request body returns the statistics
+  (200), {"error": ...} for an unreadable workbook (422), or 413/411 when the
+  body is too large or has no Content-Length.
+- GET /health returns the worker and cache counts.
+
+Requests are handled in threads; the pipeline itself runs in a pool of worker
+processes started up front from a forkserver with data_processor preloaded,
+so no request pays for imports or a process start. Results are cached by the
+SHA-256 of the upload: a repeated upload is answered from memory, and
+concurrent uploads of the same file share one run. The X-Cache response
+header says "hit" or "miss". When a worker dies, busy or idle, the request
+that finds the pool broken gets a 503 and the pool is replaced.
+"""
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import data_processor
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+CACHE_ENTRIES = 256
+REQUEST_TIMEOUT = 300
+DEFAULT_PORT = 8600
+
+
+def analyze_bytes(data):
+    """
+    Runs in a pool worker: load_data -> merge_sheets -> clean_data ->
+    generate_statistics on an uploaded workbook. Returns (JSON bytes, error).
+    """
+    # Only the statistics are returned, so the free-text columns are never read
+    sheets_dict, error = data_processor.load_data(io.BytesIO(data), mapped_only=True)
+    if error:
+        return None, error
+    try:
+        df = data_processor.clean_data(data_processor.merge_sheets(sheets_dict))
+        stats = data_processor.generate_statistics(df)
+    except Exception as e:
+        return None, f"Error processing data: {str(e)}"
+    return json.dumps(stats).encode("utf-8"), None
+
+
+def _warm_workbook():
+    """
+    A one-row workbook in memory, analyzed once by each worker at startup.
+    """
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(data_processor.STANDARD_COLUMNS)
+    sheet.append(["Team", "College", "State", "Open", 2, "No", "City", "Reviewer"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+# Barrier shared by the workers of one pool, set by _init_worker
+_warm_barrier = None
+
+
+def _init_worker(barrier):
+    global _warm_barrier
+    _warm_barrier = barrier
+    # Imports and caches that the first real request would otherwise pay for
+    analyze_bytes(_warm_workbook())
+
+
+def _ready():
+    """
+    Blocks until every worker of the pool runs it, so each of the pool's
+    processes has been started and has finished _init_worker.
+    """
+    _warm_barrier.wait(REQUEST_TIMEOUT)
+    return True
+
+
+class AnalysisService:
+    """
+    The worker pool plus a content-hash result cache of at most `cache_entries`
+    finished results (oldest evicted first). analyze(data) returns
+    (HTTP status, JSON body bytes, cache state).
+    """
+
+    def __init__(self, workers=2, cache_entries=CACHE_ENTRIES, timeout=REQUEST_TIMEOUT):
+        self.workers = workers
+        self.cache_entries = cache_entries
+        self.timeout = timeout
+        self._cache = OrderedDict()  # content hash -> Future of (JSON bytes, error)
+        self._lock = threading.Lock()
+        self._pool = self._start_pool()
+        self._generation = 0  # bumped whenever a broken pool is replaced
+        self._restarting = False
+
+    def _start_pool(self):
+        methods = multiprocessing.get_all_start_methods()
+        if "forkserver" in methods:
+            ctx = multiprocessing.get_context("forkserver")
+            # Workers are forked from a server process that has imported the pipeline once
+            ctx.set_forkserver_preload(["data_processor"])
+        else:
+            ctx = multiprocessing.get_context("spawn")
+        barrier = ctx.Barrier(self.workers)
+        pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx, initializer=_init_worker,
+                                   initargs=(barrier,))
+        # Non-fork pools start a worker per submit while none is idle. A waiting _ready
+        # keeps its worker busy, so the tasks end up in `workers` distinct, warm processes
+        for future in [pool.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+        return pool
+
+    def close(self):
+        self._pool.shutdown(cancel_futures=True)
+
+    def analyze(self, data):
+        key = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            generation = self._generation
+            future = self._cache.get(key)
+            if future is not None:
+                self._cache.move_to_end(key)
+                cache_state = "hit"
+            else:
+                cache_state = "miss"
+                try:
+                    future = self._cache[key] = self._pool.submit(analyze_bytes, data)
+                except RuntimeError:
+                    # BrokenProcessPool (a worker died while idle) or a pool being replaced
+                    future = None
+                else:
+                    self._evict()
+
+        if future is None:
+            self._restart(generation)
+            return 503, _error_body("Worker pool restarted, please retry"), cache_state
+        try:
+            body, error = future.result(self.timeout)
+        except FutureTimeout:
+            return 504, _error_body("Analysis timed out"), cache_state
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory); forget the result and replace the pool
+            self._restart(generation, key, future)
+            return 503, _error_body("Worker pool restarted, please retry"), cache_state
+        if error:
+            return 422, _error_body(error), cache_state
+        return 200, body, cache_state
+
+    def _restart(self, generation, key=None, future=None):
+        """
+        Replaces the pool of `generation` unless that already happened or is
+        under way. The new pool is started outside the lock, so cache hits and
+        health checks are answered meanwhile.
+        """
+        with self._lock:
+            if key is not None and self._cache.get(key) is future:
+                del self._cache[key]
+            if generation != self._generation or self._restarting:
+                # Another request already replaced the pool, or is replacing it
+                return
+            self._restarting = True
+            # Every future of a broken pool fails, so drop them all
+            for other in [k for k, f in self._cache.items() if f.done() and (f.cancelled() or f.exception() is not None)]:
+                del self._cache[other]
+            broken = self._pool
+
+        try:
+            broken.shutdown(wait=False, cancel_futures=True)
+            pool = self._start_pool()
+            with self._lock:
+                self._pool = pool
+                self._generation += 1
+        finally:
+            with self._lock:
+                self._restarting = False
+
+    def _evict(self):
+        for key in list(self._cache):
+            if len(self._cache) <= self.cache_entries:
+                break
+            if self._cache[key].done():
+                del self._cache[key]
+
+    def health(self):
+        with self._lock:
+            cached = sum(1 for future in self._cache.values() if future.done())
+            running = len(self._cache) - cached
+        return {"status": "ok", "workers": self.workers, "cached_results": cached, "running": running}
+
+
+def _error_body(message):
+    return json.dumps({"error": message}).encode("utf-8")
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle's algorithm
+    # holds the body back until the client's delayed ACK (~40 ms per response)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._reply(404, _error_body("Not found"))
+        self._reply(200, json.dumps(self.server.service.health()).encode("utf-8"))
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != "/analyze":
+            return self._reply(404, _error_body("Not found"))
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            return self._reply(411, _error_body("Content-Length required"), close=True)
+        length = int(length)
+        if length > self.server.max_upload_bytes:
+            # The body is not read, so the connection cannot be reused
+            return self._reply(413, _error_body(f"Upload larger than {self.server.max_upload_bytes} bytes"), close=True)
+        if length == 0:
+            return self._reply(400, _error_body("Empty upload"))
+
+        status, body, cache_state = self.server.service.analyze(self.rfile.read(length))
+        self._reply(status, body, headers={"X-Cache": cache_state})
+
+    def _reply(self, status, body, headers=None, close=False):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if close:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(service, host="127.0.0.1", port=DEFAULT_PORT, max_upload_bytes=MAX_UPLOAD_BYTES, quiet=False):
+    """
+    A ThreadingHTTPServer serving `service`. Call serve_forever() on it.
+    """
+    server = ThreadingHTTPServer((host, port), AnalysisHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.max_upload_bytes = max_upload_bytes
+    server.quiet = quiet
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the registration analysis over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="Analysis worker processes")
+    parser.add_argument("--max-upload-mb", type=float, default=MAX_UPLOAD_BYTES / 1024 / 1024)
+    parser.add_argument("--cache-entries", type=int, default=CACHE_ENTRIES, help="Results kept by content hash")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="Seconds to wait for one analysis")
+    parser.add_argument("--quiet", action="store_true", help="Do not log every request")
+    args = parser.parse_args(argv)
+
+    service = AnalysisService(args.workers, args.cache_entries, args.timeout)
+    server = make_server(service, args.host, args.port, int(args.max_upload_mb * 1024 * 1024), args.quiet)
+    print(f"Serving on http://{args.host}:{server.server_port} with {args.workers} workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
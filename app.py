@@ -1,14 +1,163 @@
 import streamlit as st
 import pandas as pd
-import json
+import atexit
+import hashlib
+import io
+import os
+import tempfile
+import time
+import uuid
 import plotly.express as px
+import chart_data
+from background_jobs import FULL_ANALYSIS, AnalysisJobs, sheet_names as read_sheet_names
 import data_processor
+import exporters
 import utils
+from raw_data_index import RawDataIndex
+from college_search import CollegeSearchIndex
+from event_store import DIMENSIONS, EventStore
 
 st.set_page_config(page_title="Hackathon Data Analyzer", layout="wide")
 
+# How many parsed workbooks / analysis results stay cached before the oldest are evicted
+WORKBOOK_CACHE_ENTRIES = 4
+ANALYSIS_CACHE_ENTRIES = 16
+
+# Seconds between reruns while a background analysis is running
+JOB_POLL_SECONDS = 0.5
+
+# SQLite file collecting cleaned registrations of every saved event
+EVENT_STORE_PATH = "events.db"
+
+@st.cache_resource(max_entries=WORKBOOK_CACHE_ENTRIES, show_spinner=False)
+def list_sheets(file_hash, _data):
+    """
+    Reads the sheet names of the uploaded workbook once per distinct file content.
+    Returns (sheet names, error).
+    """
+    return read_sheet_names(io.BytesIO(_data))
+
+@st.cache_resource
+def analysis_jobs():
+    """
+    Background analysis jobs shared by all sessions. A finished job's results
+    are shared between reruns, so callers must not modify them.
+    """
+    return AnalysisJobs(max_jobs=ANALYSIS_CACHE_ENTRIES)
+
+@st.cache_resource(max_entries=ANALYSIS_CACHE_ENTRIES, show_spinner=False)
+def build_raw_data_index(file_hash, analysis_mode, selected_sheet, _df):
+    """
+    Builds the Raw Data view's filter indexes once per analyzed dataset.
+    """
+    return RawDataIndex(_df)
+
+@st.cache_resource(max_entries=ANALYSIS_CACHE_ENTRIES, show_spinner=False)
+def build_college_search(file_hash, analysis_mode, selected_sheet, _colleges):
+    """
+    Builds the College Analysis view's search index once per analyzed dataset.
+    """
+    return CollegeSearchIndex(_colleges)
+
+@st.cache_resource(max_entries=ANALYSIS_CACHE_ENTRIES * len(chart_data.CHART_NAMES), show_spinner=False)
+def build_dashboard_figure(file_hash, analysis_mode, selected_sheet, name, _stats):
+    """
+    Builds one dashboard figure (top-N plus "Other", see chart_data) once per analyzed dataset.
+    Returns None when there is no data for it.
+    """
+    return chart_data.build_figures(_stats, names=[name]).get(name)
+
+def render_overall_metrics(overall):
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Total Teams", overall.get('total_teams', 0))
+    col2.metric("Total Participants", overall.get('total_participants', 0))
+    col3.metric("Total Colleges", overall.get('total_colleges', 0))
+    col4.metric("All Girls Teams", overall.get('all_girls_teams', 0))
+
+def statistics_section(job, key):
+    """
+    One statistics section of a finished job. While the job is still computing
+    it, shows a note and polls instead of computing it in this session.
+    """
+    if job.statistics_running and not job.stats.ready(key):
+        st.info(f"Still computing {key.replace('_', ' ')}...")
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+    return job.stats.get(key, {})
+
+def render_job_progress(job, on_cancel):
+    """
+    Progress and a cancel button, then polls again.
+    """
+    st.progress(job.progress, text=job.message)
+    if st.button("Cancel analysis"):
+        on_cancel()
+        st.rerun()
+    time.sleep(JOB_POLL_SECONDS)
+    st.rerun()
+
+@st.cache_resource
+def export_files():
+    """
+    Process-wide export directory. The least recently used files are deleted
+    beyond exporters.EXPORT_FILE_ENTRIES files or EXPORT_DISK_BYTES on disk,
+    and the directory is removed when the app exits.
+    """
+    files = exporters.ExportFiles(tempfile.mkdtemp(prefix="hackathon_exports_"))
+    atexit.register(files.clear)
+    return files
+
+def export_button(container, label, file_hash, analysis_mode, selected_sheet, name, fmt, compress, make_chunks):
+    """
+    A "Prepare" button; only the run after its click writes the export (once per
+    dataset, report and format) and offers it for download, so other reruns
+    never touch the export files.
+    """
+    file_name = exporters.export_filename(name, fmt, compress)
+    if not container.button(f"Prepare {label}", key=f"prepare_{file_name}"):
+        return
+    key = hashlib.sha256(repr((file_hash, analysis_mode, selected_sheet)).encode()).hexdigest()[:16]
+    path = export_files().write(key, file_name, make_chunks, compress=compress)
+    with open(path, "rb") as f:
+        container.download_button(
+            label=label,
+            data=f,
+            file_name=file_name,
+            mime=exporters.export_mime(fmt, compress)
+        )
+
+def render_event_comparison(store_path):
+    """
+    Cross-event comparison straight from the event store, no workbook needed.
+    """
+    st.header("Compare Events")
+    with EventStore(store_path) as store:
+        events = store.events()
+        if events.empty:
+            st.info("No events stored yet. Analyze a workbook and save it to the event store from the sidebar.")
+            return
+        st.dataframe(events, use_container_width=True, hide_index=True)
+        c1, c2, c3 = st.columns(3)
+        dimension = c1.selectbox("Compare by", list(DIMENSIONS), format_func=str.title)
+        metric = c2.selectbox("Metric", ["teams", "participants"], format_func=str.title)
+        top = c3.number_input("Top", min_value=5, max_value=500, value=20, step=5)
+        selected = st.multiselect("Events", events['event_id'].tolist(), default=events['event_id'].tolist())
+        if not selected:
+            return
+        table = store.compare(dimension, selected, metric, top)
+    st.dataframe(table, use_container_width=True)
+    chart_df = table.reset_index().melt(id_vars=dimension, var_name="Event", value_name=metric.title())
+    fig = px.bar(chart_df, x=dimension, y=metric.title(), color="Event", barmode="group",
+                 title=f"{metric.title()} per {dimension} across events")
+    st.plotly_chart(fig, use_container_width=True)
+
 st.title("📊 Hackathon Registration Data Analyzer")
 st.sidebar.text(f"DP Version: {getattr(data_processor, 'VERSION', 'Unknown')}")
+show_profile = st.sidebar.checkbox("Show pipeline profile", value=False,
+                                   help="How long each pipeline stage took")
+st.sidebar.subheader("Event Store")
+store_path = st.sidebar.text_input("Store file", EVENT_STORE_PATH)
+compare_events = st.sidebar.checkbox("Compare stored events", value=False)
 st.markdown("Upload your Excel file to generate comprehensive statistics and insights.")
 
 # File Uploader
@@ -16,9 +165,11 @@ uploaded_file = st.file_uploader("Upload Excel File", type=['xlsx', 'xls'])
 
 if uploaded_file is not None:
     with st.spinner("Processing data..."):
-        # Load Data
-        # Load Data
-        sheets_dict, error = data_processor.load_data(uploaded_file)
+        # Only sheet names are read here; the workbook is parsed by a background job
+        # (one per file content, mode and sheet, so widget reruns skip the reparse)
+        file_bytes = uploaded_file.getvalue()
+        file_hash = hashlib.sha256(file_bytes).hexdigest()
+        sheet_names, error = list_sheets(file_hash, file_bytes)
         
         if error:
             st.error(error)
@@ -26,55 +177,94 @@ if uploaded_file is not None:
             # Analysis Mode Selection
             analysis_mode = st.radio(
                 "Select Analysis Mode",
-                ["Full Analysis (Merge All Sheets)", "Individual Sheet Analysis"],
+                [FULL_ANALYSIS, "Individual Sheet Analysis"],
                 horizontal=True
             )
             
             df = None
+            selected_sheet = None
             
-            if analysis_mode == "Full Analysis (Merge All Sheets)":
-                df = data_processor.merge_sheets(sheets_dict)
-                st.info(f"Analyzing merged data from {len(sheets_dict)} sheets.")
+            if analysis_mode == FULL_ANALYSIS:
+                st.info(f"Analyzing merged data from {len(sheet_names)} sheets.")
             else:
-                sheet_names = list(sheets_dict.keys())
                 selected_sheet = st.selectbox("Select Sheet to Analyze", sheet_names)
                 if selected_sheet:
-                    df = sheets_dict[selected_sheet]
                     st.info(f"Analyzing data from sheet: {selected_sheet}")
             
-            if df is not None:
-                # Clean Data
-                df = data_processor.clean_data(df)
-                
-                # Generate Statistics
-                stats = data_processor.generate_statistics(df)
-            
+            if analysis_mode == FULL_ANALYSIS or selected_sheet:
+                # Load, Clean Data and Generate Statistics in the background
+                # Jobs are shared between sessions: Cancel withdraws this session only,
+                # and the job stops once no other session is waiting for it
+                jobs = analysis_jobs()
+                job_key = (file_hash, analysis_mode, selected_sheet)
+                session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+                cancelled_jobs = st.session_state.setdefault("cancelled_jobs", set())
+                if job_key in cancelled_jobs:
+                    st.warning("Analysis cancelled.")
+                    if st.button("Restart analysis"):
+                        cancelled_jobs.discard(job_key)
+                        st.rerun()
+                    st.stop()
+                job = jobs.get_or_start(*job_key, io.BytesIO(file_bytes), len(sheet_names), subscriber=session_id)
+                if not job.done:
+                    def cancel_job():
+                        cancelled_jobs.add(job_key)
+                        jobs.discard(*job_key, subscriber=session_id)
+                    render_job_progress(job, cancel_job)
+                if job.status == "cancelled":
+                    cancelled_jobs.add(job_key)
+                    st.rerun()
+                if job.error:
+                    st.error(job.error)
+                    st.stop()
+                df, stats = job.df, job.stats
+
+                # Save the cleaned data as one event for cross-event comparisons
+                with st.sidebar.form("save_event"):
+                    event_id = st.text_input("Event id", os.path.splitext(uploaded_file.name)[0])
+                    if st.form_submit_button("Save to event store") and event_id:
+                        with EventStore(store_path) as store:
+                            saved = store.ingest(df, event_id)
+                        st.success(f"Stored {saved} rows as {event_id}")
+
+                if show_profile:
+                    # The report comes from the job's run, not from this rerun
+                    # (no load stages when the job reused an earlier job's sheets)
+                    with st.sidebar.expander("Pipeline profile", expanded=True):
+                        st.dataframe(job.report.to_frame().drop(columns="depth"), hide_index=True, use_container_width=True)
+                        st.download_button(
+                            label="Download Profile (JSON)",
+                            data=job.report.to_json(),
+                            file_name="pipeline_profile.json",
+                            mime="application/json"
+                        )
+
             # --- Dashboard ---
             
             # Overall Metrics
             st.header("Overall Statistics")
-            col1, col2, col3, col4 = st.columns(4)
+            render_overall_metrics(stats.get('overall_statistics', {}))
             
-            overall = stats.get('overall_statistics', {})
-            col1.metric("Total Teams", overall.get('total_teams', 0))
-            col2.metric("Total Participants", overall.get('total_participants', 0))
-            col3.metric("Total Colleges", overall.get('total_colleges', 0))
-            col4.metric("All Girls Teams", overall.get('all_girls_teams', 0))
+            # Figures are built once per dataset; reruns only resend them
+            def figure(name):
+                return build_dashboard_figure(file_hash, analysis_mode, selected_sheet, name, stats)
             
-            # Tabs for detailed analysis
-            tab1, tab2, tab3, tab4, tab5 = st.tabs(["College Analysis", "Domain Distribution", "Geography", "Team Size", "Raw Data"])
+            # One view at a time (unlike st.tabs, which runs every tab); each view waits
+            # for its statistics section from the job instead of computing it here
+            view = st.radio("View", ["College Analysis", "Domain Distribution", "Geography", "Team Size", "Raw Data"],
+                            horizontal=True, label_visibility="collapsed")
             
-            with tab1:
+            if view == "College Analysis":
                 st.subheader("College Participation Analysis")
-                all_colleges = stats.get('college_wise_statistics', {}).get('all_colleges', [])
+                all_colleges = statistics_section(job, 'college_wise_statistics').get('all_colleges', [])
                 
                 if all_colleges:
-                    college_df = pd.DataFrame(all_colleges)
+                    college_index = build_college_search(file_hash, analysis_mode, selected_sheet, all_colleges)
                     
-                    # Explicit Filter for College Name
+                    # Explicit Filter for College Name (prefix, abbreviation and substring matches, best first)
                     search_term = st.text_input("🔍 Search College Name", "")
-                    if search_term:
-                        college_df = college_df[college_df['college_name'].str.contains(search_term, case=False, na=False)]
+                    matches = college_index.search(search_term)
+                    college_df = college_index.frame.iloc[matches]
                     
                     # Display full table
                     st.caption(f"Showing {len(college_df)} colleges")
@@ -84,107 +274,119 @@ if uploaded_file is not None:
                         hide_index=True
                     )
                     
-                    # Chart for top 20 only to keep it readable
+                    # Chart for top 20 only to keep it readable (ids follow the team count order)
                     st.subheader("Top 20 Colleges")
-                    top_20_df = college_df.head(20)
-                    fig = px.bar(top_20_df, x='college_name', y='total_teams', title="Top 20 Colleges by Team Count")
+                    if search_term:
+                        top_20_df = college_index.frame.iloc[sorted(matches)[:chart_data.CHART_TOP_N]]
+                        fig = chart_data.figure({
+                            "x": top_20_df['college_name'].tolist(),
+                            "y": top_20_df['total_teams'].tolist(),
+                            "title": f"Top {len(top_20_df)} Matching Colleges by Team Count",
+                            "axes": ("College", "Teams"),
+                            "kind": "bar",
+                        })
+                    else:
+                        fig = figure('colleges')
                     st.plotly_chart(fig, use_container_width=True)
                 else:
                     st.info("No college data available.")
                     
-            with tab2:
+            elif view == "Domain Distribution":
                 st.subheader("Domain Distribution")
-                domain_data = stats.get('domain_wise_distribution', {})
-                if domain_data:
-                    # Convert dict to list for plotting
-                    domain_list = []
-                    for d, data in domain_data.items():
-                        domain_list.append({"Domain": d, "Teams": data['total_teams']})
-                    
-                    domain_df = pd.DataFrame(domain_list)
-                    fig = px.pie(domain_df, values='Teams', names='Domain', title="Teams per Domain")
-                    st.plotly_chart(fig, use_container_width=True)
+                statistics_section(job, 'domain_wise_distribution')
+                domains_fig = figure('domains')
+                if domains_fig:
+                    st.plotly_chart(domains_fig, use_container_width=True)
                 else:
                     st.info("No domain data available.")
 
-            with tab3:
+            elif view == "Geography":
                 st.subheader("Geographical Distribution")
-                state_data = stats.get('geographical_distribution', {}).get('state_wise', [])
-                if state_data:
-                    state_df = pd.DataFrame(state_data)
-                    fig = px.bar(state_df, x='state', y='total_teams', title="Teams by State")
-                    st.plotly_chart(fig, use_container_width=True)
+                statistics_section(job, 'geographical_distribution')
+                states_fig = figure('states')
+                if states_fig:
+                    st.plotly_chart(states_fig, use_container_width=True)
                 else:
                     st.info("No state data available.")
+                cities_fig = figure('cities')
+                if cities_fig:
+                    st.plotly_chart(cities_fig, use_container_width=True)
 
-            with tab4:
+            elif view == "Team Size":
                 st.subheader("Team Size Analysis")
-                size_stats = stats.get('team_size_analysis', {})
+                size_stats = statistics_section(job, 'team_size_analysis')
                 if size_stats:
-                    # Create a simple dataframe for the bar chart
-                    size_data = {
-                        "Category": ["Solo", "Small (2-3)", "Full (4-5)"],
-                        "Count": [size_stats.get('solo_teams', 0), size_stats.get('small_teams_2_3', 0), size_stats.get('full_teams_4_5', 0)]
-                    }
-                    fig = px.bar(pd.DataFrame(size_data), x='Category', y='Count', title="Team Size Distribution")
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(figure('team_sizes'), use_container_width=True)
                     
                     st.metric("Average Team Size", size_stats.get('average_team_size', 0))
                 else:
                     st.info("No team size data available.")
             
-            with tab5:
+            else:
                 st.subheader("Raw Data")
                 
-                # Dynamic Filters for Raw Data
+                # Dynamic Filters for Raw Data (indexes are built once per dataset)
+                raw_index = build_raw_data_index(file_hash, analysis_mode, selected_sheet, df)
+                selections = {}
+                searches = {}
                 with st.expander("🔍 Advanced Filters (All Columns)", expanded=False):
-                    filtered_df = df.copy()
-                    
                     # Create 3 columns for filters to save space
                     cols = st.columns(3)
                     
-                    for i, column in enumerate(filtered_df.columns):
+                    for i, column in enumerate(raw_index.columns):
                         col_idx = i % 3
                         with cols[col_idx]:
-                            # Check if column is categorical (few unique values)
-                            if filtered_df[column].nunique() < 20:
-                                options = sorted([str(x) for x in filtered_df[column].unique() if pd.notna(x)])
-                                selected = st.multiselect(f"Filter {column}", options, key=f"filter_{column}")
-                                if selected:
-                                    filtered_df = filtered_df[filtered_df[column].astype(str).isin(selected)]
+                            # Categorical columns (few unique values) filter through the inverted index
+                            if raw_index.is_categorical(column):
+                                selections[column] = st.multiselect(f"Filter {column}", raw_index.options[column], key=f"filter_{column}")
                             else:
                                 # Text search for other columns
-                                search_txt = st.text_input(f"Search {column}", key=f"search_{column}")
-                                if search_txt:
-                                    filtered_df = filtered_df[filtered_df[column].astype(str).str.contains(search_txt, case=False, na=False)]
+                                searches[column] = st.text_input(f"Search {column}", key=f"search_{column}")
+                
+                matching_ids = raw_index.filter(selections, searches)
+                
+                # Only one page of rows is sent to the browser
+                page_col, size_col = st.columns([3, 1])
+                page_size = size_col.selectbox("Rows per page", [50, 100, 500, 1000], index=1, key="raw_page_size")
+                page_count = RawDataIndex.page_count(matching_ids, page_size)
+                page = page_col.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
                 
-                st.caption(f"Showing {len(filtered_df)} records")
-                st.dataframe(filtered_df, use_container_width=True, hide_index=True)
+                first_row = (page - 1) * page_size
+                st.caption(f"Showing {min(first_row + 1, len(matching_ids))}-{min(first_row + page_size, len(matching_ids))} of {len(matching_ids)} records")
+                st.dataframe(raw_index.page(matching_ids, page, page_size), use_container_width=True, hide_index=True)
 
             # --- Downloads ---
             st.divider()
             st.subheader("Export Reports")
             
-            c1, c2 = st.columns(2)
-            
-            # JSON Report
-            json_str = json.dumps(stats, indent=2)
-            c1.download_button(
-                label="Download Full Statistics (JSON)",
-                data=json_str,
-                file_name="hackathon_statistics.json",
-                mime="application/json"
-            )
-            
-            # CSV Report (Summary of Colleges)
-            if all_colleges:
-                csv_data = pd.DataFrame(all_colleges).to_csv(index=False).encode('utf-8')
-                c2.download_button(
-                    label="Download College Summary (CSV)",
-                    data=csv_data,
-                    file_name="college_summary.csv",
-                    mime="text/csv"
-                )
+            # The exports need every statistics section, so they wait for the user and for the job
+            if st.checkbox("Prepare downloads", value=False):
+                for key in stats:
+                    statistics_section(job, key)
+                compress = st.checkbox("Compress downloads (gzip)", value=False)
+                c1, c2, c3, c4 = st.columns(4)
+                # Exports are written to disk chunk by chunk (never as one string) on request, and kept per dataset
+                export_key = (file_hash, analysis_mode, selected_sheet)
+                
+                # JSON Report
+                export_button(c1, "Download Full Statistics (JSON)", *export_key, "hackathon_statistics", "json", compress,
+                              lambda: exporters.iter_json(stats.to_dict()))
+                
+                # CSV Report (Summary of Colleges)
+                all_colleges = stats.get('college_wise_statistics', {}).get('all_colleges', [])
+                if all_colleges:
+                    export_button(c2, "Download College Summary (CSV)", *export_key, "college_summary", "csv", compress,
+                                  lambda: exporters.iter_csv(pd.DataFrame(all_colleges)))
+
+                # Cleaned registrations
+                export_button(c3, "Download Cleaned Data (CSV)", *export_key, "cleaned_data", "csv", compress,
+                              lambda: exporters.iter_csv(df))
+                export_button(c4, "Download Cleaned Data (NDJSON)", *export_key, "cleaned_data", "ndjson", compress,
+                              lambda: exporters.iter_ndjson(df))
 
 else:
     st.info("Please upload an Excel file to begin.")
+
+if compare_events:
+    st.divider()
+    render_event_comparison(store_path)
@@ -0,0 +1,266 @@
+"""
+Background analysis jobs for the app: load_data -> merge/select -> clean_data ->
+overall statistics run in a worker thread, while the session polls the job for
+progress. Once the overview is published the same thread goes on computing the
+remaining statistics sections, so the dashboard only reads finished ones.
+
+Progress and cancellation ride on the profiling stages the pipeline already
+marks: every stage start/end updates the job and checks for a cancel request.
+"""
+import threading
+from collections import OrderedDict
+
+import data_processor
+import profiling
+
+FULL_ANALYSIS = "Full Analysis (Merge All Sheets)"
+
+# Share of the progress bar per pipeline phase
+LOAD_WEIGHT = 0.6
+CLEAN_WEIGHT = 0.15
+STATISTICS_WEIGHT = 0.25
+
+# Statistics sections a job computes before it reports done; the others are
+# computed after that, while the dashboard already shows the overview
+EAGER_SECTIONS = ("overall_statistics",)
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside the worker at the next stage boundary after cancel().
+    A BaseException, so the pipeline's per-sheet `except Exception` handlers
+    do not swallow it.
+    """
+
+
+class _JobProfile(profiling.PipelineProfile):
+    """
+    Records stages like any profile and forwards each start/end to the job.
+    """
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+
+    def _open(self, stage):
+        self.job._check_cancelled()
+        self.job._stage_started(stage.record["stage"])
+        super()._open(stage)
+
+    def _close(self, stage):
+        super()._close(stage)
+        self.job._stage_finished(stage.record["stage"])
+        self.job._check_cancelled()
+
+
+def sheet_names(file):
+    """
+    Returns (sheet names, error) without parsing the sheets.
+    """
+    try:
+        with data_processor.open_workbook(file) as workbook:
+            return workbook.sheet_names, None
+    except Exception as e:
+        return None, f"Error reading Excel file: {str(e)}"
+
+
+class AnalysisJob:
+    """
+    One run of the pipeline in a daemon thread.
+
+    Poll `status` ("running", "done", "failed" or "cancelled"), `progress`
+    (0..1) and `message`. `sheets_dict`, `df`, `stats` (data_processor.LazySections,
+    with EAGER_SECTIONS computed by the time the job is done) and `report` (the
+    stage profile) are set as the pipeline reaches them. After the job is done,
+    `statistics_running` stays True while the remaining sections are computed;
+    check `stats.ready(key)` before reading one so the caller does not compute it.
+    Pass the sheets_dict of an earlier job on the same workbook to skip loading.
+    """
+
+    def __init__(self, source, analysis_mode=FULL_ANALYSIS, selected_sheet=None, sheets_dict=None, sheet_count=None):
+        self.source = source
+        self.analysis_mode = analysis_mode
+        self.selected_sheet = selected_sheet
+        self.sheets_dict = sheets_dict
+        self.sheet_count = sheet_count or (len(sheets_dict) if sheets_dict else None)
+        self.df = None
+        self.stats = None
+        self.error = None
+        self.report = None
+        self.status = "running"
+        self.statistics_running = False
+        self.subscribers = set()  # sessions showing this job, see AnalysisJobs
+        self.progress = 0.0
+        self.message = "Starting"
+        self._sheets_read = 0
+        self._sections_done = 0
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="analysis-job", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """
+        Asks the worker to stop at the next stage boundary (a sheet being parsed finishes first).
+        """
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        self._thread.join(timeout)
+        return self.done
+
+    @property
+    def done(self):
+        return self.status != "running"
+
+    # --- Worker side ---
+
+    def _check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def _stage_started(self, path):
+        name = path.rsplit("/", 1)[-1]
+        if path.startswith("load_data/sheet "):
+            self.message = f"Reading {name[len('sheet '):]}"
+            if self.sheet_count:
+                self.message += f" ({self._sheets_read + 1} of {self.sheet_count})"
+        elif path.startswith("clean_data"):
+            self.message = f"Cleaning: {name}" if "/" in path else "Cleaning"
+        elif path.startswith("generate_statistics/"):
+            self.message = f"Computing {name.replace('_', ' ')}"
+
+    def _stage_finished(self, path):
+        if path.startswith("load_data/sheet "):
+            self._sheets_read += 1
+            if self.sheet_count:
+                self.progress = LOAD_WEIGHT * min(1.0, self._sheets_read / self.sheet_count)
+        elif path == "load_data":
+            self.progress = LOAD_WEIGHT
+        elif path == "clean_data":
+            self.progress = LOAD_WEIGHT + CLEAN_WEIGHT
+        elif path.startswith("generate_statistics/") and path != "generate_statistics/factorize keys":
+            self._sections_done += 1
+            fraction = min(1.0, self._sections_done / len(EAGER_SECTIONS))
+            self.progress = LOAD_WEIGHT + CLEAN_WEIGHT + STATISTICS_WEIGHT * fraction
+
+    def _run(self):
+        profile = _JobProfile(self)
+        token = profiling._ACTIVE.set(profile)
+        # Sessions read the report as soon as the job is done, while later stages are still recorded
+        self.report = profile
+        try:
+            error = self._pipeline()
+            if error:
+                self.error, self.message, self.status = error, "Failed", "failed"
+            else:
+                self.statistics_running = True
+                self.progress, self.message, self.status = 1.0, "Done", "done"
+                self._remaining_statistics()
+        except JobCancelled:
+            self.message, self.status = "Cancelled", "cancelled"
+        except Exception as e:
+            self.error, self.message, self.status = f"Error processing data: {str(e)}", "Failed", "failed"
+        finally:
+            self.statistics_running = False
+            profiling._ACTIVE.reset(token)
+
+    def _remaining_statistics(self):
+        """
+        Computes every statistics section after EAGER_SECTIONS. A cancel or an
+        error stops it; the sections left are then computed when first read,
+        which raises the error where the section is shown.
+        """
+        try:
+            with profiling.stage("remaining_statistics"):
+                self.stats.to_dict()
+        except (JobCancelled, Exception):
+            pass
+        finally:
+            self.statistics_running = False
+
+    def _pipeline(self):
+        """
+        Runs the stages, publishing results as they appear. Returns an error message or None.
+        """
+        if self.sheets_dict is None:
+            sheets_dict, error = data_processor.load_data(self.source)
+            if error:
+                return error
+            self.sheets_dict = sheets_dict
+        self.progress = LOAD_WEIGHT
+
+        if self.analysis_mode == FULL_ANALYSIS:
+            df = data_processor.merge_sheets(self.sheets_dict)
+        else:
+            df = self.sheets_dict[self.selected_sheet]
+        self.df = data_processor.clean_data(df)
+
+        stats = data_processor.lazy_statistics(self.df)
+        with profiling.stage("generate_statistics", rows_in=len(self.df)):
+            for key in EAGER_SECTIONS:
+                stats.get(key)
+        self.stats = stats
+        return None
+
+
+class AnalysisJobs:
+    """
+    Process-wide registry of analysis jobs keyed by (file hash, analysis mode,
+    selected sheet). Later jobs on a workbook reuse the sheets an earlier job
+    already loaded. Keeps at most `max_jobs` jobs, evicting the oldest finished ones.
+
+    Jobs are shared, so each session subscribes to the jobs it shows and a
+    cancel only withdraws that session: the job stops once no subscriber is left.
+    """
+
+    def __init__(self, max_jobs=16):
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_start(self, file_hash, analysis_mode, selected_sheet, source, sheet_count=None, subscriber=None):
+        key = (file_hash, analysis_mode, selected_sheet)
+        with self._lock:
+            job = self._jobs.get(key)
+            # A cancelled job is replaced by a fresh run
+            if job is not None and job.status != "cancelled":
+                self._jobs.move_to_end(key)
+                if subscriber is not None:
+                    job.subscribers.add(subscriber)
+                return job
+            loaded = next((j.sheets_dict for k, j in reversed(self._jobs.items())
+                           if k[0] == file_hash and j.sheets_dict is not None), None)
+            job = AnalysisJob(source, analysis_mode, selected_sheet, sheets_dict=loaded, sheet_count=sheet_count)
+            if subscriber is not None:
+                job.subscribers.add(subscriber)
+            self._jobs[key] = job
+            self._evict()
+        return job.start()
+
+    def discard(self, file_hash, analysis_mode, selected_sheet, subscriber=None):
+        """
+        Withdraws `subscriber` from a job. Once no subscriber is left, the job is
+        cancelled (if still running) and forgotten, so the next get_or_start runs it again.
+        Returns True if the job was cancelled.
+        """
+        key = (file_hash, analysis_mode, selected_sheet)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return False
+            job.subscribers.discard(subscriber)
+            if job.subscribers:
+                return False
+            del self._jobs[key]
+        job.cancel()
+        return True
+
+    def _evict(self):
+        for key in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[key].done:
+                del self._jobs[key]
@@ -0,0 +1,193 @@
+"""
+Headless batch analyzer: runs load_data -> merge_sheets -> clean_data ->
+generate_statistics over every workbook in a directory and writes the
+statistics JSON per file (in workbooks/) plus a combined file.
+
+    python batch_analyze.py exports/ -o stats/ --workers 4
+
+Streamlit and Plotly are never imported, and pandas is only imported inside
+the functions that need it, so the command starts quickly (e.g. from cron).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+WORKBOOK_SUFFIXES = (".xlsx", ".xls")
+
+# Subdirectory of the output directory holding one statistics report per workbook
+WORKBOOK_REPORTS_DIR = "workbooks"
+
+
+def find_workbooks(directory):
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(WORKBOOK_SUFFIXES) and not name.startswith("~$")
+    )
+
+
+def analyze_workbook(path, with_state=True, profile=False, approximate=False):
+    """
+    Runs the full pipeline on one workbook. Returns a dictionary with the stats,
+    per-stage timings in seconds, an error message (or None), if with_state,
+    a StatisticsState for the combined report and, if profile, the detailed
+    stage profile as a dictionary. With approximate, the stats and the state come
+    from a sketch-based ApproximateStatisticsState.
+    """
+    import profiling
+
+    result = {"file": path, "stats": None, "state": None, "timings": {}, "error": None, "profile": None}
+    with profiling.profile(enabled=profile) as report:
+        try:
+            _run_pipeline(path, with_state, approximate, result)
+        except Exception as e:
+            result["error"] = f"Error processing data: {str(e)}"
+    if report is not None:
+        result["profile"] = report.to_dict()
+    return result
+
+
+def _run_pipeline(path, with_state, approximate, result):
+    timings = result["timings"]
+    start = time.perf_counter()
+    import data_processor
+    timings["import"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    # Only the statistics are written, so the free-text columns are never read
+    sheets_dict, error = data_processor.load_data(path, mapped_only=True)
+    timings["load"] = time.perf_counter() - start
+    if error:
+        result["error"] = error
+        return result
+
+    start = time.perf_counter()
+    df = data_processor.merge_sheets(sheets_dict)
+    timings["merge"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df = data_processor.clean_data(df)
+    timings["clean"] = time.perf_counter() - start
+
+    if approximate:
+        from sketches import ApproximateStatisticsState as State
+    else:
+        from statistics_state import StatisticsState as State
+    # The state's to_dict() is the per-file report (the same JSON as generate_statistics),
+    # so the statistics are computed once for both reports
+    start = time.perf_counter()
+    state = State().update(df)
+    result["stats"] = state.to_dict()
+    timings["statistics"] = time.perf_counter() - start
+    if with_state:
+        result["state"] = state
+    return result
+
+
+def _run_parallel(paths, workers, with_state, profile, approximate):
+    """
+    Runs analyze_workbook over the paths in a process pool. A worker that raises
+    fails only its own workbook, recorded in result["error"] like the serial
+    path does. A worker that dies breaks the whole pool and every workbook not
+    finished by then, so those are rerun each in a fresh single-process pool:
+    only a workbook that crashes its worker again is recorded as failed.
+    """
+    results = {}
+    broken = _run_pool(paths, workers, with_state, profile, approximate, results)
+    for path in broken:
+        _run_pool([path], 1, with_state, profile, approximate, results)
+    return [results[path] for path in paths]
+
+
+def _run_pool(paths, workers, with_state, profile, approximate, results):
+    """
+    Runs analyze_workbook over the paths in one process pool, storing each
+    result in results[path]. Returns the paths that failed because the pool broke.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from concurrent.futures.process import BrokenProcessPool
+
+    broken = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze_workbook, path, with_state, profile, approximate): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    broken.append(path)
+                results[path] = {"file": path, "stats": None, "state": None, "timings": {},
+                                 "error": f"Worker failed: {e!r}", "profile": None}
+    return [path for path in paths if path in broken]
+
+
+def report_name(path):
+    """
+    File name of a workbook's statistics report: the full workbook name, so
+    a.xlsx and a.xls do not overwrite each other.
+    """
+    return os.path.basename(path) + ".json"
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze every workbook in a directory without the Streamlit UI.")
+    parser.add_argument("directory", help="Directory containing .xlsx/.xls exports")
+    parser.add_argument("-o", "--output", default="stats", help="Directory for the JSON reports (default: stats)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Workbooks processed in parallel")
+    parser.add_argument("--no-combined", action="store_true", help="Skip the combined report across all files")
+    parser.add_argument("--profile", action="store_true", help="Write a per-stage profile of every workbook to profile.json")
+    parser.add_argument("--approximate", action="store_true",
+                        help="Estimate distinct counts and top colleges with fixed-size sketches (see sketches.py)")
+    args = parser.parse_args(argv)
+
+    paths = find_workbooks(args.directory)
+    if not paths:
+        print(f"No workbooks found in {args.directory}", file=sys.stderr)
+        return 1
+    # Per-workbook reports get their own directory, apart from combined/timings/profile
+    workbook_dir = os.path.join(args.output, WORKBOOK_REPORTS_DIR)
+    os.makedirs(workbook_dir, exist_ok=True)
+
+    with_state = not args.no_combined
+    started = time.perf_counter()
+    if args.workers > 1 and len(paths) > 1:
+        results = _run_parallel(paths, min(args.workers, len(paths)), with_state, args.profile, args.approximate)
+    else:
+        results = [analyze_workbook(path, with_state, args.profile, args.approximate) for path in paths]
+
+    combined = None
+    timing_report = {}
+    failures = 0
+    for result in results:
+        timing_report[result["file"]] = {stage: round(seconds, 4) for stage, seconds in result["timings"].items()}
+        if result["error"]:
+            failures += 1
+            print(f"{result['file']}: {result['error']}", file=sys.stderr)
+            continue
+        _write_json(os.path.join(workbook_dir, report_name(result["file"])), result["stats"])
+        if with_state:
+            combined = result["state"] if combined is None else combined.merge(result["state"])
+
+    if combined is not None:
+        _write_json(os.path.join(args.output, "combined.json"), combined.to_dict())
+    _write_json(os.path.join(args.output, "timings.json"), timing_report)
+    if args.profile:
+        _write_json(os.path.join(args.output, "profile.json"), {result["file"]: result["profile"] for result in results})
+
+    stages = ["load", "merge", "clean", "statistics"]
+    print(f"{'file':<40} " + " ".join(f"{stage:>10}" for stage in stages))
+    for path, timings in timing_report.items():
+        print(f"{os.path.basename(path)[:40]:<40} " + " ".join(f"{timings.get(stage, 0):>10.3f}" for stage in stages))
+    print(f"{len(paths) - failures}/{len(paths)} workbooks analyzed in {time.perf_counter() - started:.2f}s -> {args.output}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import argparse
+import json
+import time
+
+import chart_data
+import data_processor
+from synthetic_workbook import make_registrations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart payload size and build time as the dataset grows, with and without top-N bucketing.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'cities':>7} {'all points (bytes)':>19} {'top-N (bytes)':>14} {'build (ms)':>11}")
+    for rows in args.sizes:
+        stats = data_processor.generate_statistics(data_processor.clean_data(make_registrations(rows)))
+        # Every category plotted, as the tabs did before bucketing
+        full = chart_data.build_chart_data(stats, top_n=10**9)
+        start = time.perf_counter()
+        compact = chart_data.build_chart_data(stats)
+        elapsed = time.perf_counter() - start
+        cities = len(stats['geographical_distribution']['city_wise'])
+        print(f"{rows:>9} {cities:>7} {len(json.dumps(full)):>19} {len(json.dumps(compact)):>14} {elapsed * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import time
+
+import pandas as pd
+
+import college_matching
+from synthetic_workbook import make_names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark blocked fuzzy clustering of college names.")
+    parser.add_argument("--distinct", type=int, nargs="+", default=[5_000, 20_000, 50_000])
+    args = parser.parse_args()
+
+    print(f"{'names':>8} {'pairs':>10} {'all pairs':>14} {'time (s)':>9} {'typos caught':>13} {'false merges':>13}")
+    for distinct in args.distinct:
+        names, truth = make_names(distinct)
+        keys = [college_matching.match_key(n) for n in names]
+        start = time.perf_counter()
+        pairs = college_matching.candidate_pairs(keys)
+        clusters = college_matching.cluster_names(keys)
+        elapsed = time.perf_counter() - start
+
+        # A typo is caught when it lands in the same cluster as its true college's name
+        first_of = {}
+        for t, c in zip(truth, clusters):
+            first_of.setdefault(t, c)
+        typos = [(t, c) for i, (t, c) in enumerate(zip(truth, clusters)) if i >= len(set(truth))]
+        caught = sum(1 for t, c in typos if first_of[t] == c) / max(1, len(typos))
+        members = pd.DataFrame({"truth": truth, "cluster": clusters})
+        false_merges = int((members.groupby("cluster")["truth"].nunique() > 1).sum())
+        print(f"{distinct:>8} {len(pairs):>10} {distinct * (distinct - 1) // 2:>14} {elapsed:>9.2f} {caught:>12.1%} {false_merges:>13}")
+
+
+if __name__ == "__main__":
+    main()
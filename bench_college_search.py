@@ -0,0 +1,46 @@
+import argparse
+import time
+
+import pandas as pd
+
+from college_search import CollegeSearchIndex
+from synthetic_workbook import make_names
+
+QUERIES = ["rmk", "r.m.k", "svce", "ssn", "raja", "kabo", "xq", "engineering col"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the College Analysis search index against str.contains.")
+    parser.add_argument("--colleges", type=int, nargs="+", default=[5_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'colleges':>9} {'query':<16} {'matches':>8} {'index (ms)':>11} {'contains (ms)':>14}")
+    for n in args.colleges:
+        names, _ = make_names(n, typo_share=0)
+        names += ["R.M.K. Engineering College", "SSN College of Engineering"]
+        colleges = [{"college_name": name, "total_teams": 1, "total_participants": 4} for name in names]
+
+        start = time.perf_counter()
+        index = CollegeSearchIndex(colleges)
+        print(f"{n:>9} {'(build)':<16} {'':>8} {(time.perf_counter() - start) * 1000:>11.1f}")
+
+        college_df = pd.DataFrame(colleges)
+        for query in QUERIES:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                matches = index.search(query)
+            indexed = (time.perf_counter() - start) / args.repeat
+
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                expected = college_df[college_df["college_name"].str.contains(query, case=False, regex=False, na=False)]
+            scan = (time.perf_counter() - start) / args.repeat
+
+            # Every substring hit must also be found by the index
+            assert set(expected.index) <= set(matches), query
+            print(f"{n:>9} {query:<16} {len(matches):>8} {indexed * 1000:>11.3f} {scan * 1000:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import data_processor
+from event_store import DIMENSIONS, EventStore
+from synthetic_workbook import make_registrations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite event store: ingestion, statistics and cross-event comparisons.")
+    parser.add_argument("--events", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows per event")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with EventStore(os.path.join(tmp, "events.db")) as store:
+            frames = {}
+            start = time.perf_counter()
+            for i in range(args.events):
+                event_id = f"event-{i + 1}"
+                frames[event_id] = data_processor.clean_data(make_registrations(args.rows, seed=i))
+                store.ingest(frames[event_id], event_id)
+            print(f"Ingested {args.events} x {args.rows} rows (incl. cleaning) in {time.perf_counter() - start:.1f}s")
+
+            event_id, df = next(iter(frames.items()))
+            start = time.perf_counter()
+            expected = data_processor.generate_statistics(df)
+            in_memory = time.perf_counter() - start
+            start = time.perf_counter()
+            stats = store.statistics(event_id)
+            sql = time.perf_counter() - start
+            identical = json.dumps(stats, indent=2) == json.dumps(expected, indent=2)
+            print(f"Statistics of one event: SQL {sql:.2f}s, generate_statistics {in_memory:.2f}s, identical: {identical}")
+
+            for dimension in DIMENSIONS:
+                start = time.perf_counter()
+                table = store.compare(dimension, top=20)
+                print(f"compare {dimension:<8} over {args.events * args.rows} rows: {time.perf_counter() - start:.2f}s ({len(table)} rows shown)")
+
+
+if __name__ == "__main__":
+    main()
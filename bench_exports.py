@@ -0,0 +1,49 @@
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+import data_processor
+import exporters
+from synthetic_workbook import make_registrations
+
+
+def measure(func):
+    """
+    Returns (seconds, peak traced bytes) of one call.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare in-memory and chunked exports (time and peak traced memory).")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'export':<22} {'time (s)':>9} {'peak (MB)':>10}")
+    for rows in args.rows:
+        df = data_processor.clean_data(make_registrations(rows))
+        stats = data_processor.generate_statistics(df)
+        with open(os.devnull, "wb") as sink:
+            cases = {
+                "csv (string)": lambda: sink.write(df.to_csv(index=False).encode("utf-8")),
+                "csv (chunked)": lambda: exporters.write_export(exporters.iter_csv(df), sink),
+                "csv.gz (chunked)": lambda: exporters.write_export(exporters.iter_csv(df), sink, compress=True),
+                "ndjson (chunked)": lambda: exporters.write_export(exporters.iter_ndjson(df), sink),
+                "stats json (string)": lambda: sink.write(json.dumps(stats, indent=2).encode("utf-8")),
+                "stats json (chunked)": lambda: exporters.write_export(exporters.iter_json(stats), sink),
+            }
+            for name, func in cases.items():
+                elapsed, peak = measure(func)
+                print(f"{rows:>9} {name:<22} {elapsed:>9.2f} {peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import json
+import time
+
+import pandas as pd
+
+import data_processor
+from statistics_state import StatisticsState
+from synthetic_workbook import make_registrations
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark folding a small batch into a large StatisticsState.")
+    parser.add_argument("--history", type=int, default=500_000)
+    parser.add_argument("--delta", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    history = make_registrations(args.history, seed=1)
+    build_time, state = timed(StatisticsState().update, history)
+    print(f"history of {args.history} rows folded in {build_time:.2f}s")
+
+    print(f"{'delta':>8} {'update (s)':>11} {'to_dict (s)':>12} {'recompute (s)':>14} {'identical':>10}")
+    for i, rows in enumerate(args.delta):
+        delta = make_registrations(rows, seed=100 + i)
+        combined = pd.concat([history, delta], ignore_index=True)
+
+        update_time, _ = timed(state.update, delta)
+        render_time, incremental = timed(state.to_dict)
+        recompute_time, expected = timed(data_processor.generate_statistics, combined)
+        identical = json.dumps(incremental, indent=2) == json.dumps(expected, indent=2)
+        print(f"{rows:>8} {update_time:>11.4f} {render_time:>12.4f} {recompute_time:>14.4f} {str(identical):>10}")
+        history = combined
+
+    # merge() must agree with folding the rows in one go
+    first, second = make_registrations(20_000, seed=7), make_registrations(20_000, seed=8)
+    merged = StatisticsState().update(first).merge(StatisticsState().update(second)).to_dict()
+    expected = data_processor.generate_statistics(pd.concat([first, second], ignore_index=True))
+    print(f"merge matches concatenated recompute: {json.dumps(merged) == json.dumps(expected)}")
+
+
+if __name__ == "__main__":
+    main()
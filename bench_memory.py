@@ -0,0 +1,20 @@
+import argparse
+
+import data_processor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show bytes per column of the cleaned frame before and after compact dtypes.")
+    parser.add_argument("workbook")
+    args = parser.parse_args()
+
+    sheets_dict, error = data_processor.load_data(args.workbook)
+    if error:
+        raise SystemExit(error)
+    df = data_processor.clean_data(data_processor.merge_sheets(sheets_dict), compact=False)
+    print(f"{len(df)} rows")
+    print(data_processor.memory_report(df).to_string())
+
+
+if __name__ == "__main__":
+    main()
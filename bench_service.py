@@ -0,0 +1,107 @@
+import argparse
+import http.client
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from synthetic_workbook import write_workbook
+
+
+def make_uploads(count, rows, sheets):
+    """
+    `count` different synthetic workbooks as bytes (different seeds, so different content hashes).
+    """
+    uploads = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for seed in range(count):
+            path = os.path.join(tmp, f"upload{seed}.xlsx")
+            write_workbook(path, rows, sheets, seed=seed)
+            with open(path, "rb") as f:
+                uploads.append(f.read())
+    return uploads
+
+
+def run_load(url, uploads, requests, concurrency):
+    """
+    Sends `requests` POSTs (cycling through `uploads`) from `concurrency` threads,
+    each on its own keep-alive connection. Returns (wall seconds, latencies, statuses, cache states).
+    """
+    parts = urlsplit(url)
+    local = threading.local()
+    counter = iter(range(requests))
+    lock = threading.Lock()
+
+    def post(_):
+        with lock:
+            i = next(counter)
+        connection = getattr(local, "connection", None)
+        if connection is None:
+            connection = local.connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=600)
+        start = time.perf_counter()
+        connection.request("POST", "/analyze", body=uploads[i % len(uploads)],
+                           headers={"Content-Type": "application/octet-stream"})
+        response = connection.getresponse()
+        response.read()
+        return time.perf_counter() - start, response.status, response.getheader("X-Cache")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(post, range(requests)))
+    wall = time.perf_counter() - start
+    latencies, statuses, cache_states = zip(*results)
+    return wall, np.array(latencies), statuses, cache_states
+
+
+def report(phase, wall, latencies, statuses, cache_states):
+    ok = sum(status == 200 for status in statuses)
+    hits = sum(state == "hit" for state in cache_states)
+    print(f"{phase:<10} {len(latencies):>8} {ok:>5} {hits:>5} {len(latencies) / wall:>9.1f} "
+          f"{np.percentile(latencies, 50) * 1000:>9.1f} {np.percentile(latencies, 99) * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test analysis_service: requests/sec and latency percentiles.")
+    parser.add_argument("--url", help="A running service (default: start one in this process)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Pool size of the started service")
+    parser.add_argument("--uploads", type=int, default=8, help="Distinct workbooks")
+    parser.add_argument("--rows", type=int, default=2_000, help="Rows per workbook")
+    parser.add_argument("--sheets", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=200, help="Requests in the cached phase")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server = service = None
+    url = args.url
+    if url is None:
+        import analysis_service
+
+        start = time.perf_counter()
+        service = analysis_service.AnalysisService(args.workers)
+        server = analysis_service.make_server(service, port=0, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}"
+        print(f"service with {args.workers} warm workers ready in {time.perf_counter() - start:.2f}s")
+
+    uploads = make_uploads(args.uploads, args.rows, args.sheets)
+    print(f"{len(uploads)} workbooks of {args.rows} rows, {sum(map(len, uploads)) / len(uploads) / 1024:.0f} KB each, "
+          f"concurrency {args.concurrency}")
+    print(f"{'phase':<10} {'requests':>8} {'ok':>5} {'hits':>5} {'req/s':>9} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    try:
+        # Every upload is new: each request runs the pipeline in a worker
+        report("uncached", *run_load(url, uploads, len(uploads), args.concurrency))
+        # The same uploads again: answered from the content-hash cache
+        report("cached", *run_load(url, uploads, args.requests, args.concurrency))
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import argparse
+import pickle
+import time
+
+import numpy as np
+
+import data_processor
+from sketches import ApproximateStatisticsState
+from statistics_state import StatisticsState
+from synthetic_workbook import make_registrations
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def relative_errors(exact, approximate):
+    """
+    Relative errors of the team and college counts of every group, against the exact statistics.
+    """
+    pairs = [(exact['overall_statistics']['total_teams'], approximate['overall_statistics']['total_teams'])]
+    for key, entry in exact['domain_wise_distribution'].items():
+        pairs.append((entry['total_teams'], approximate['domain_wise_distribution'][key]['total_teams']))
+    for section, name in (('state_wise', 'state'), ('city_wise', 'city')):
+        estimated = {e[name]: e for e in approximate['geographical_distribution'][section]}
+        for entry in exact['geographical_distribution'][section]:
+            for field in ('total_teams', 'total_colleges'):
+                pairs.append((entry[field], estimated[entry[name]][field]))
+    estimated = {e['college_name']: e['total_teams'] for e in approximate['college_wise_statistics']['all_colleges']}
+    for entry in exact['college_wise_statistics']['all_colleges']:
+        pairs.append((entry['total_teams'], estimated[entry['college_name']]))
+    true, estimate = np.array(pairs, dtype=float).T
+    return np.abs(estimate - true) / np.maximum(true, 1)
+
+
+def top_k_recall(exact, approximate):
+    """
+    Share of the exact top colleges (per domain and state) that the sketches also report.
+    """
+    hits = total = 0
+    for key, entry in exact['domain_wise_distribution'].items():
+        hits += len(set(entry['top_colleges']) & set(approximate['domain_wise_distribution'][key]['top_colleges']))
+        total += len(entry['top_colleges'])
+    estimated = {e['state']: e['top_colleges'] for e in approximate['geographical_distribution']['state_wise']}
+    for entry in exact['geographical_distribution']['state_wise']:
+        hits += len(set(entry['top_colleges']) & set(estimated[entry['state']]))
+        total += len(entry['top_colleges'])
+    return hits / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the sketch-based ApproximateStatisticsState with the exact one.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--batches", type=int, default=4, help="Batches folded separately and merged for the merge check")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'state':>12} {'update (s)':>11} {'size (MB)':>10} {'median err':>11} "
+          f"{'p95 err':>8} {'max err':>8} {'top-k recall':>13} {'merge ok':>9}")
+    for rows in args.rows:
+        df = data_processor.clean_data(make_registrations(rows, seed=1))
+        exact_time, exact = timed(StatisticsState().update, df)
+        approx_time, approx = timed(ApproximateStatisticsState().update, df)
+        exact_stats, approx_stats = exact.to_dict(), approx.to_dict()
+
+        # Folding the batches separately and merging must give the same estimates
+        merged = ApproximateStatisticsState()
+        for batch in np.array_split(np.arange(len(df)), args.batches):
+            merged.merge(ApproximateStatisticsState().update(df.iloc[batch]))
+        merge_ok = merged.to_dict() == approx_stats
+
+        errors = relative_errors(exact_stats, approx_stats)
+        for name, elapsed, state in (("exact", exact_time, exact), ("approximate", approx_time, approx)):
+            size = len(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)) / 1e6
+            if name == "exact":
+                print(f"{rows:>9} {name:>12} {elapsed:>11.2f} {size:>10.1f}")
+            else:
+                print(f"{rows:>9} {name:>12} {elapsed:>11.2f} {size:>10.1f} {np.median(errors):>11.2%} "
+                      f"{np.percentile(errors, 95):>8.2%} {errors.max():>8.2%} "
+                      f"{top_k_recall(exact_stats, approx_stats):>13.0%} {str(merge_ok):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import profiling
+from synthetic_workbook import write_registrations_workbook
+
+
+def _run(mode, path, chunk_size, queue):
+    import data_processor
+
+    baseline = profiling.peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "full":
+        sheets_dict, error = data_processor.load_data(path)
+        df = data_processor.clean_data(data_processor.merge_sheets(sheets_dict))
+        stats = data_processor.generate_statistics(df)
+    else:
+        stats, error = data_processor.stream_statistics(path, chunk_size=chunk_size)
+    elapsed = time.perf_counter() - start
+    queue.put((elapsed, baseline, profiling.peak_rss_mb(), json.dumps(stats, indent=2)))
+
+
+def measure(mode, path, chunk_size):
+    """
+    Runs one ingestion path in a fresh process so peak RSS is not shared between runs.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(mode, path, chunk_size, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and streaming workbook ingestion.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    parser.add_argument("--sheets", type=int, default=5)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'mode':>9} {'time (s)':>9} {'rows/s':>9} {'peak RSS (MB)':>14} {'over baseline':>14} {'identical':>10}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "registrations.xlsx")
+            write_registrations_workbook(path, rows, args.sheets)
+            results = {mode: measure(mode, path, args.chunk_size) for mode in ("full", "streaming")}
+        identical = results["full"][3] == results["streaming"][3]
+        for mode, (elapsed, baseline, peak, _) in results.items():
+            print(f"{rows:>8} {mode:>9} {elapsed:>9.2f} {rows / elapsed:>9.0f} {peak:>14.1f} {peak - baseline:>14.1f} {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    main()
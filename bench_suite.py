@@ -0,0 +1,181 @@
+"""
+Pipeline benchmark suite: times every stage of load_data -> merge_sheets ->
+clean_data -> generate_statistics on synthetic raw workbooks of increasing size,
+writes the results as JSON and compares them with a stored baseline.
+
+    python bench_suite.py --save-baseline bench_baseline.json
+    python bench_suite.py --baseline bench_baseline.json --threshold 0.25
+
+Exits with status 1 when any stage is slower than the baseline by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+import data_processor
+import profiling
+import utils
+from synthetic_workbook import write_workbook
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Relative slowdown reported as a regression
+DEFAULT_THRESHOLD = 0.2
+
+# Stages faster than this in both runs are too noisy to compare
+DEFAULT_MIN_SECONDS = 0.01
+
+
+def workbook_path(directory, rows, sheets, typo_rate, duplicate_rate, header_variants, seed):
+    """
+    Generates the workbook for one configuration unless a previous run already did.
+    """
+    name = f"synthetic_{rows}_{sheets}_{typo_rate}_{duplicate_rate}_{int(header_variants)}_{seed}.xlsx"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        write_workbook(path + ".tmp.xlsx", rows, sheets, typo_rate, header_variants, duplicate_rate, seed)
+        os.replace(path + ".tmp.xlsx", path)
+    return path
+
+
+def run_once(path):
+    """
+    One cold run of the pipeline (normalization and schema caches emptied first).
+    Returns (seconds per stage path, total seconds, rows loaded, rows after cleaning).
+    """
+    utils.clear_normalization_cache()
+    data_processor.resolve_schema.cache_clear()
+    with profiling.profile() as report:
+        sheets_dict, error = data_processor.load_data(path)
+        if error:
+            raise RuntimeError(error)
+        df = data_processor.clean_data(data_processor.merge_sheets(sheets_dict))
+        data_processor.generate_statistics(df)
+    stages = {record["stage"]: record["seconds"] for record in report.records}
+    return stages, report.seconds, sum(len(sheet) for sheet in sheets_dict.values()), len(df)
+
+
+def run_suite(sizes, repeat, directory, sheets, typo_rate, duplicate_rate, header_variants, seed):
+    """
+    Best-of-`repeat` seconds per stage for every size.
+    """
+    results = {}
+    for rows in sizes:
+        path = workbook_path(directory, rows, sheets, typo_rate, duplicate_rate, header_variants, seed)
+        best, total = {}, float("inf")
+        for _ in range(repeat):
+            stages, seconds, rows_loaded, rows_clean = run_once(path)
+            for stage, elapsed in stages.items():
+                best[stage] = min(best.get(stage, float("inf")), elapsed)
+            total = min(total, seconds)
+        results[str(rows)] = {"rows_loaded": rows_loaded, "rows_clean": rows_clean, "total": total, "stages": best}
+        print(f"{rows:>9} rows: {total:8.3f}s  ({rows_loaded / total:,.0f} rows/s)", file=sys.stderr)
+    return results
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, min_seconds=DEFAULT_MIN_SECONDS):
+    """
+    Returns a DataFrame with one row per (size, stage) present in both runs and
+    a `regression` flag for stages more than `threshold` slower than the baseline.
+    """
+    rows = []
+    for size, result in current["results"].items():
+        reference = baseline["results"].get(size)
+        if reference is None:
+            continue
+        timings = dict(result["stages"], total=result["total"])
+        reference_timings = dict(reference["stages"], total=reference["total"])
+        for stage, seconds in timings.items():
+            if stage not in reference_timings:
+                continue
+            before = reference_timings[stage]
+            change = seconds / before - 1 if before else 0.0
+            rows.append({
+                "rows": int(size),
+                "stage": stage,
+                "baseline": before,
+                "current": seconds,
+                "change": change,
+                "regression": change > threshold and max(seconds, before) >= min_seconds,
+            })
+    return pd.DataFrame(rows, columns=["rows", "stage", "baseline", "current", "change", "regression"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on synthetic workbooks and check for regressions.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sheets", type=int, default=5)
+    parser.add_argument("--typo-rate", type=float, default=0.05)
+    parser.add_argument("--duplicate-rate", type=float, default=0.02)
+    parser.add_argument("--standard-headers", action="store_true", help="Use the standard header on every sheet")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workbook-dir", default=os.path.join(tempfile.gettempdir(), "hackathon_bench_workbooks"),
+                        help="Where generated workbooks are kept between runs")
+    parser.add_argument("-o", "--output", help="Write this run's results as JSON")
+    parser.add_argument("--save-baseline", help="Write this run's results as the new baseline")
+    parser.add_argument("--baseline", help="Compare this run with a stored baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative slowdown flagged as a regression")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS, help="Ignore stages faster than this")
+    args = parser.parse_args()
+
+    config = {
+        "sheets": args.sheets,
+        "typo_rate": args.typo_rate,
+        "duplicate_rate": args.duplicate_rate,
+        "header_variants": not args.standard_headers,
+        "seed": args.seed,
+        "repeat": args.repeat,
+    }
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "version": data_processor.VERSION,
+        },
+        "config": config,
+        "results": run_suite(args.sizes, args.repeat, args.workbook_dir, args.sheets, args.typo_rate,
+                             args.duplicate_rate, not args.standard_headers, args.seed),
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+
+    if not args.baseline:
+        for size, result in report["results"].items():
+            print(f"\n{size} rows ({result['rows_clean']} after cleaning)")
+            for stage, seconds in result["stages"].items():
+                print(f"  {stage:<55} {seconds:>9.4f}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"Warning: baseline was recorded with {baseline.get('config')}", file=sys.stderr)
+    comparison = compare(baseline, report, args.threshold, args.min_seconds)
+    width = comparison["stage"].str.len().max() if len(comparison) else 0
+    print(comparison.to_string(index=False, formatters={
+        "stage": lambda stage: stage.ljust(width),
+        "baseline": "{:.4f}".format,
+        "current": "{:.4f}".format,
+        "change": "{:+.1%}".format,
+        "regression": lambda flag: "REGRESSION" if flag else "",
+    }))
+    regressions = comparison[comparison["regression"]]
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    return 1 if len(regressions) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+import openpyxl
+
+import profiling
+from synthetic_workbook import make_registrations
+
+MODES = {
+    "openpyxl": {"engine": "openpyxl"},
+    "xlsx": {"engine": "xlsx"},
+    "xlsx mapped": {"engine": "xlsx", "mapped_only": True},
+}
+
+
+def write_wide_workbook(path, rows, sheets, extra_columns, seed=0):
+    """
+    Writes a registration workbook whose sheets carry `extra_columns` free-text
+    columns (member e-mails, phone numbers, notes, ...) next to the standard
+    ones, like raw portal exports do.
+    """
+    df = make_registrations(rows, seed=seed).drop(columns=["Source Sheet"])
+    df = df.astype(object).where(df.notna(), None)
+    header = list(df.columns) + [f"Extra Field {i + 1}" for i in range(extra_columns)]
+    workbook = openpyxl.Workbook(write_only=True)
+    per_sheet = -(-rows // sheets)
+    for i in range(sheets):
+        sheet = workbook.create_sheet(f"Round {i + 1}")
+        sheet.append(header)
+        for n, record in enumerate(df.iloc[i * per_sheet:(i + 1) * per_sheet].itertuples(index=False, name=None)):
+            sheet.append(record + tuple(f"member{n}.{j}@example.org" for j in range(extra_columns)))
+    workbook.save(path)
+
+
+def _digest(sheets_dict, mapped_only):
+    """
+    Per sheet: column names and a content hash, of the whole frame or of the mapped columns only.
+    """
+    import data_processor
+    import pandas as pd
+
+    digest = {}
+    for name, df in sheets_dict.items():
+        if mapped_only:
+            df = df[[col for col in df.columns if data_processor.resolve_column(col) is not None]]
+        digest[name] = (list(map(str, df.columns)), [str(t) for t in df.dtypes],
+                        int(pd.util.hash_pandas_object(df, index=False).sum()))
+    return digest
+
+
+def _run(mode, path, queue):
+    import data_processor
+
+    baseline = profiling.peak_rss_mb()
+    start = time.perf_counter()
+    sheets_dict, error = data_processor.load_data(path, **MODES[mode])
+    elapsed = time.perf_counter() - start
+    peak = profiling.peak_rss_mb()
+    queue.put((elapsed, baseline, peak, _digest(sheets_dict, False), _digest(sheets_dict, True)))
+
+
+def measure(mode, path):
+    """
+    Loads the workbook in a fresh process so peak RSS is not shared between runs.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(mode, path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the xlsx fast-path reader with pd.read_excel (openpyxl).")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--sheets", type=int, default=2)
+    parser.add_argument("--extra-columns", type=int, default=30, help="Free-text columns besides the 8 standard ones")
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'mode':>12} {'time (s)':>9} {'speedup':>8} {'peak RSS (MB)':>14} {'over baseline':>14} {'identical':>10}")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "registrations.xlsx")
+            write_wide_workbook(path, rows, args.sheets, args.extra_columns)
+            results = {mode: measure(mode, path) for mode in MODES}
+        reference = results["openpyxl"]
+        for mode, (elapsed, baseline, peak, full, mapped) in results.items():
+            # Mapped-only frames are compared on the columns they keep
+            identical = mapped == reference[4] if MODES[mode].get("mapped_only") else full == reference[3]
+            print(f"{rows:>8} {mode:>12} {elapsed:>9.2f} {reference[0] / elapsed:>7.1f}x {peak:>14.1f} "
+                  f"{peak - baseline:>14.1f} {str(identical):>10}")
+
+
+if __name__ == "__main__":
+    main()
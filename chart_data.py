@@ -0,0 +1,101 @@
+"""
+Plotting arrays for the dashboard charts, computed once per dataset from the
+statistics dictionary. Long category lists (colleges, states, cities) are cut
+to the top CHART_TOP_N entries plus an "Other" bucket, so the size of every
+figure stays constant however large the dataset grows.
+"""
+
+# Bars/slices per chart before the remainder is folded into "Other"
+CHART_TOP_N = 20
+
+OTHER_LABEL = "Other"
+
+
+def top_n_with_other(labels, values, n=CHART_TOP_N, other_label=OTHER_LABEL):
+    """
+    Returns (labels, values) with the n largest values in descending order
+    (ties keep their input order) and, if anything was cut, one more entry
+    holding the sum of the rest.
+    """
+    order = sorted(range(len(values)), key=lambda i: -values[i])
+    top = order[:n]
+    out_labels = [labels[i] for i in top]
+    out_values = [values[i] for i in top]
+    if len(order) > n:
+        out_labels.append(other_label)
+        out_values.append(sum(values[i] for i in order[n:]))
+    return out_labels, out_values
+
+
+# Dashboard charts in display order
+CHART_NAMES = ["colleges", "domains", "states", "cities", "team_sizes"]
+
+
+def build_chart_data(stats, top_n=CHART_TOP_N, names=None):
+    """
+    {chart name: {"x": labels, "y": values, "title": ..., "axes": (x title, y title), "kind": "bar" | "pie"}}
+    for every dashboard chart, or only those in `names` (so lazy statistics
+    compute only the sections those charts read). Only plain lists, so the
+    result is cheap to cache and to serialize.
+    """
+    charts = {}
+    names = CHART_NAMES if names is None else names
+
+    colleges = stats.get('college_wise_statistics', {}).get('all_colleges', []) if "colleges" in names else []
+    if colleges:
+        # all_colleges is already ordered by team count
+        charts['colleges'] = {
+            "x": [c['college_name'] for c in colleges[:top_n]],
+            "y": [c['total_teams'] for c in colleges[:top_n]],
+            "title": f"Top {min(top_n, len(colleges))} Colleges by Team Count",
+            "axes": ("College", "Teams"),
+            "kind": "bar",
+        }
+
+    domains = stats.get('domain_wise_distribution', {}) if "domains" in names else {}
+    if domains:
+        labels, values = top_n_with_other(list(domains), [d['total_teams'] for d in domains.values()], top_n)
+        charts['domains'] = {"x": labels, "y": values, "title": "Teams per Domain", "axes": ("Domain", "Teams"), "kind": "pie"}
+
+    for name, key, label in (("states", "state_wise", "state"), ("cities", "city_wise", "city")):
+        rows = stats.get('geographical_distribution', {}).get(key, []) if name in names else []
+        if rows:
+            labels, values = top_n_with_other([r[label] for r in rows], [r['total_teams'] for r in rows], top_n)
+            shown = f" (top {top_n} of {len(rows)})" if len(rows) > top_n else ""
+            charts[name] = {"x": labels, "y": values, "title": f"Teams by {label.title()}{shown}",
+                            "axes": (label.title(), "Teams"), "kind": "bar"}
+
+    sizes = stats.get('team_size_analysis', {}) if "team_sizes" in names else {}
+    if sizes:
+        charts['team_sizes'] = {
+            "x": ["Solo", "Small (2-3)", "Full (4-5)"],
+            "y": [sizes.get('solo_teams', 0), sizes.get('small_teams_2_3', 0), sizes.get('full_teams_4_5', 0)],
+            "title": "Team Size Distribution",
+            "axes": ("Category", "Count"),
+            "kind": "bar",
+        }
+    return charts
+
+
+def figure(chart):
+    """
+    The Plotly figure of one build_chart_data entry, as a plain dictionary
+    (what st.plotly_chart accepts and what gets cached).
+    """
+    import plotly.graph_objects as go  # only the app renders figures
+
+    x_title, y_title = chart["axes"]
+    if chart["kind"] == "pie":
+        fig = go.Figure(go.Pie(labels=chart["x"], values=chart["y"]))
+    else:
+        fig = go.Figure(go.Bar(x=chart["x"], y=chart["y"]))
+        fig.update_layout(xaxis_title=x_title, yaxis_title=y_title)
+    fig.update_layout(title=chart["title"])
+    return fig.to_dict()
+
+
+def build_figures(stats, top_n=CHART_TOP_N, names=None):
+    """
+    {chart name: figure dictionary} for every dashboard chart (or those in `names`).
+    """
+    return {name: figure(chart) for name, chart in build_chart_data(stats, top_n, names).items()}
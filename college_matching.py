@@ -0,0 +1,184 @@
+import argparse
+import re
+from difflib import SequenceMatcher
+
+import pandas as pd
+import utils
+
+# Candidate pairs below this similarity (difflib ratio of the lowercase names) are not merged
+DEFAULT_THRESHOLD = 0.9
+
+# Names compared with each of their neighbours in the two sorted-neighbourhood passes
+NEIGHBOURHOOD_WINDOW = 4
+
+# Token blocks larger than this are skipped; a token that common does not identify a college
+MAX_BLOCK_SIZE = 25
+
+# Words too common in college names to serve as blocking keys
+STOPWORDS = {
+    "college", "engineering", "institute", "technology", "university", "of", "and", "the",
+    "school", "science", "sciences", "arts", "academy", "polytechnic", "group", "institutions",
+}
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def match_key(name):
+    """
+    The lookup form of a raw college name, as normalize_college_name builds it:
+    trimmed, whitespace collapsed and lowercased.
+    """
+    return utils._WHITESPACE_RE.sub(' ', str(name).strip()).lower()
+
+
+def _blocking_token(key):
+    """
+    The longest distinctive word of a name, used to block word-order variants together.
+    """
+    tokens = [t for t in _PUNCTUATION_RE.sub(' ', key).split() if t not in STOPWORDS and len(t) >= 4]
+    return max(tokens, key=len) if tokens else None
+
+
+def candidate_pairs(keys, window=NEIGHBOURHOOD_WINDOW, max_block_size=MAX_BLOCK_SIZE):
+    """
+    Index pairs worth comparing, from three blocking passes over the distinct keys:
+    sorted neighbourhood on the names, sorted neighbourhood on the reversed names
+    (catches typos near the start) and blocks sharing their longest distinctive word.
+    Produces O(n * (window + max_block_size)) pairs instead of n^2 / 2.
+    """
+    pairs = set()
+    for sort_key in (lambda i: keys[i], lambda i: keys[i][::-1]):
+        order = sorted(range(len(keys)), key=sort_key)
+        for pos, i in enumerate(order):
+            for j in order[pos + 1:pos + window + 1]:
+                pairs.add((min(i, j), max(i, j)))
+
+    blocks = {}
+    for i, key in enumerate(keys):
+        token = _blocking_token(key)
+        if token is not None:
+            blocks.setdefault(token, []).append(i)
+    for members in blocks.values():
+        if 1 < len(members) <= max_block_size:
+            for a, i in enumerate(members):
+                for j in members[a + 1:]:
+                    pairs.add((i, j))
+    return pairs
+
+
+def similarity(a, b, threshold=DEFAULT_THRESHOLD):
+    """
+    difflib ratio of two match keys, or 0 when they carry different numbers
+    ("Campus 1" and "Campus 2" are different colleges however similar they look)
+    or when the cheap upper bounds already fall short of `threshold`.
+    """
+    if _DIGITS_RE.findall(a) != _DIGITS_RE.findall(b):
+        return 0.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+        return 0.0
+    return matcher.ratio()
+
+
+def cluster_names(keys, threshold=DEFAULT_THRESHOLD):
+    """
+    Groups keys whose candidate pairs score at least `threshold`.
+    Returns a list of cluster ids aligned with keys.
+    """
+    parent = list(range(len(keys)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in candidate_pairs(keys):
+        if similarity(keys[i], keys[j], threshold) >= threshold:
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+    return [find(i) for i in range(len(keys))]
+
+
+def build_alias_table(names, threshold=DEFAULT_THRESHOLD):
+    """
+    Clusters raw college names (a Series, e.g. the College Name column before clean_data)
+    and returns a reviewable alias table with columns alias, canonical, similarity and count.
+    Each cluster's canonical name is the normalized form of its most frequent spelling.
+    Only aliases that would normalize to something else are listed.
+    """
+    counts = names.dropna().map(match_key).value_counts()
+    counts = counts[counts.index != ""]
+    keys = counts.index.tolist()
+    clusters = cluster_names(keys, threshold)
+
+    # Canonical spelling per cluster: most frequent key (value_counts order), first seen wins ties
+    canonical_key = {}
+    for key, cluster in zip(keys, clusters):
+        canonical_key.setdefault(cluster, key)
+
+    rows = []
+    for key, cluster, count in zip(keys, clusters, counts.tolist()):
+        target = canonical_key[cluster]
+        if key == target:
+            continue
+        canonical = utils.normalize_college_name(target, use_aliases=False)
+        if utils.normalize_college_name(key, use_aliases=False) == canonical:
+            continue
+        rows.append({
+            "alias": key,
+            "canonical": canonical,
+            "similarity": round(SequenceMatcher(None, key, target, autojunk=False).ratio(), 3),
+            "count": int(count),
+        })
+    table = pd.DataFrame(rows, columns=["alias", "canonical", "similarity", "count"])
+    return table.sort_values(["canonical", "count"], ascending=[True, False], kind="stable").reset_index(drop=True)
+
+
+def save_alias_table(table, path):
+    """
+    Writes the alias table as CSV for review. Rows can be deleted or edited by hand.
+    """
+    table.to_csv(path, index=False)
+
+
+def load_alias_table(path):
+    """
+    Reads a reviewed alias table and returns it as an {alias: canonical} dictionary.
+    """
+    table = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return dict(zip(table["alias"], table["canonical"]))
+
+
+def apply_alias_table(path):
+    """
+    Loads a reviewed alias table into normalize_college_name.
+    """
+    utils.set_college_aliases(load_alias_table(path))
+
+
+def main():
+    import data_processor
+
+    parser = argparse.ArgumentParser(description="Find misspelled college names in a workbook and write a reviewable alias table.")
+    parser.add_argument("workbook")
+    parser.add_argument("-o", "--output", default="college_aliases.csv")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    sheets_dict, error = data_processor.load_data(args.workbook)
+    if error:
+        raise SystemExit(error)
+    # Raw names from whichever header each sheet uses for the college column
+    columns = [df[col] for df in sheets_dict.values() for col in df.columns
+               if data_processor.resolve_column(col) == "College Name"]
+    names = pd.concat(columns, ignore_index=True) if columns else pd.Series(dtype=object)
+    table = build_alias_table(names, args.threshold)
+    save_alias_table(table, args.output)
+    print(f"Wrote {len(table)} aliases to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
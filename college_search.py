@@ -0,0 +1,122 @@
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+# Words left out of the short abbreviation ("Sri Venkateswara College of Engineering" -> "svce")
+ABBREVIATION_STOPWORDS = {"of", "and", "the", "for", "in"}
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Result tiers, best first
+EXACT, NAME_PREFIX, WORD_PREFIX, ABBREVIATION, SUBSTRING = range(5)
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def abbreviations(name):
+    """
+    Initials of a college name with and without short connecting words:
+    "R.M.K. Engineering College" -> {"rmkec"}, "SSN College of Engineering" -> {"ssncoe", "ssnce"}.
+    """
+    words = _WORD_RE.findall(name.lower())
+    full = "".join(w[0] for w in words)
+    short = "".join(w[0] for w in words if w not in ABBREVIATION_STOPWORDS)
+    return {a for a in (full, short) if len(a) > 1}
+
+
+class CollegeSearchIndex:
+    """
+    Search over the college_wise_statistics["all_colleges"] entries, built once per dataset.
+
+    Matches exact names, name prefixes, word prefixes, abbreviations ("rmk" finds
+    R.M.K. Engineering College) and substrings (through bigram/trigram indexes), and ranks
+    them in that order; within a tier, colleges keep their statistics order
+    (most teams first).
+    """
+
+    def __init__(self, colleges):
+        self.frame = pd.DataFrame(colleges, columns=["college_name", "total_teams", "total_participants"])
+        names = [str(name).lower() for name in self.frame["college_name"].tolist()]
+        self.names = names
+
+        # Sorted (key, id) lists answer prefix queries with two bisections
+        self._name_keys = sorted((name, i) for i, name in enumerate(names))
+        self._word_keys = sorted({(word, i) for i, name in enumerate(names) for word in _WORD_RE.findall(name)})
+        self._abbreviation_keys = sorted({(a, i) for i, name in enumerate(names) for a in abbreviations(name)})
+
+        # n-gram postings (sorted college ids) for substring queries of two or more characters
+        trigrams, bigrams = {}, {}
+        for i, name in enumerate(names):
+            for gram in _trigrams(name):
+                trigrams.setdefault(gram, []).append(i)
+            for gram in {name[j:j + 2] for j in range(len(name) - 1)}:
+                bigrams.setdefault(gram, []).append(i)
+        self._trigrams = {gram: np.array(ids, dtype=np.int32) for gram, ids in trigrams.items()}
+        self._bigrams = {gram: np.array(ids, dtype=np.int32) for gram, ids in bigrams.items()}
+        self._empty = np.empty(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def _prefix_ids(keys, prefix):
+        ids = []
+        for position in range(bisect_left(keys, (prefix,)), len(keys)):
+            key, i = keys[position]
+            if not key.startswith(prefix):
+                break
+            ids.append(i)
+        return ids
+
+    def _substring_ids(self, query):
+        if len(query) == 1:
+            return np.flatnonzero([query in name for name in self.names])
+        if len(query) == 2:
+            return self._bigrams.get(query, self._empty)
+        grams = sorted(_trigrams(query), key=lambda g: len(self._trigrams.get(g, ())))
+        candidates = self._trigrams.get(grams[0], self._empty)
+        for gram in grams[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, self._trigrams.get(gram, self._empty), assume_unique=True)
+        # Trigrams can match out of order, so confirm the substring
+        return candidates[[query in self.names[i] for i in candidates.tolist()]]
+
+    def search(self, query, limit=None):
+        """
+        Returns the ids (row positions in self.frame) of matching colleges, best match first.
+        """
+        query = " ".join(query.lower().split())
+        if not query:
+            return list(range(len(self.names)))
+
+        name_ids = self._prefix_ids(self._name_keys, query)
+        compact = query.replace(".", "").replace(" ", "")
+        matches = [
+            (EXACT, [i for i in name_ids if self.names[i] == query]),
+            (NAME_PREFIX, name_ids),
+            (WORD_PREFIX, self._prefix_ids(self._word_keys, query)),
+            (ABBREVIATION, self._prefix_ids(self._abbreviation_keys, compact) if compact else []),
+            (SUBSTRING, self._substring_ids(query)),
+        ]
+
+        # Best tier per college: tiers are applied best first and never overwritten
+        unmatched = len(matches)
+        tiers = np.full(len(self.names), unmatched, dtype=np.int8)
+        for tier, ids in matches:
+            ids = np.asarray(ids, dtype=np.int64)
+            ids = ids[tiers[ids] == unmatched]
+            tiers[ids] = tier
+        ids = np.flatnonzero(tiers != unmatched)
+        ranked = ids[np.argsort(tiers[ids], kind="stable")].tolist()
+        return ranked[:limit] if limit is not None else ranked
+
+    def results(self, query, limit=None):
+        """
+        The matching rows of self.frame, best match first.
+        """
+        return self.frame.iloc[self.search(query, limit)]
@@ -1,5 +1,19 @@
+import io
+import os
+import threading
+from collections import namedtuple
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, lru_cache
+
+import numpy as np
+import openpyxl
 import pandas as pd
+import profiling
 import utils
+import xlsx_reader
+from sketches import ApproximateStatisticsState
+from statistics_state import HashSet, StatisticsState, sort_key
 
 VERSION = "1.1"
 
@@ -20,31 +34,109 @@ COLUMN_MAPPING = {
     "Reviewed by": "Reviewed By"
 }
 
-def load_data(file):
+STANDARD_COLUMNS = ["Team Name", "College Name", "State", "Domain", "Team Strength", "All Girls", "City", "Reviewed By"]
+
+# Rows are duplicates when these agree; free-text columns (emails, notes, ...) are not compared
+DEDUP_COLUMNS = STANDARD_COLUMNS + ["Source Sheet"]
+
+# Case-insensitive lookup built once; the first COLUMN_MAPPING key wins, as in the original scan
+_LOWER_COLUMN_MAPPING = {}
+for _key, _val in COLUMN_MAPPING.items():
+    _LOWER_COLUMN_MAPPING.setdefault(_key.lower(), _val)
+
+ColumnSchema = namedtuple("ColumnSchema", ["columns", "keep", "missing", "dedup_columns"])
+
+def resolve_column(col):
+    """
+    Returns the standard column name a raw header maps to, or None.
+    """
+    if col in COLUMN_MAPPING:
+        return COLUMN_MAPPING[col]
+    return _LOWER_COLUMN_MAPPING.get(str(col).lower())
+
+@lru_cache(maxsize=256)
+def resolve_schema(header):
+    """
+    Resolves a header tuple once: the renamed columns, the positions to keep
+    (first occurrence of each name), the standard columns that are missing and
+    the columns deduplication compares. Sheets sharing a header share the result.
+    """
+    columns = [resolve_column(col) or col for col in header]
+    seen = set()
+    keep = []
+    for position, col in enumerate(columns):
+        if col not in seen:
+            seen.add(col)
+            keep.append(position)
+    kept = [columns[position] for position in keep]
+    missing = tuple(col for col in STANDARD_COLUMNS if col not in seen)
+    dedup_columns = tuple(col for col in kept + list(missing) if col in DEDUP_COLUMNS)
+    return ColumnSchema(tuple(kept), tuple(keep), missing, dedup_columns)
+
+def _is_mapped_column(name):
+    return resolve_column(name) is not None
+
+# Workbook readers: "xlsx" parses the sheet XML directly (see xlsx_reader),
+# "openpyxl" is pd.read_excel's default engine
+READER_ENGINES = ("xlsx", "openpyxl")
+
+def open_workbook(file, engine="xlsx"):
+    """
+    Opens a workbook for reading sheet by sheet: an object with `sheet_names`
+    and `parse(sheet_name, usecols=None)`. With engine="xlsx" that is the fast
+    XlsxWorkbook, except for files that are not .xlsx packages (e.g. .xls),
+    which like engine="openpyxl" get a pd.ExcelFile.
+    """
+    if engine not in READER_ENGINES:
+        raise ValueError(f"Unknown reader engine {engine!r}, expected one of {READER_ENGINES}")
+    if engine == "xlsx" and xlsx_reader.is_xlsx(file):
+        return xlsx_reader.XlsxWorkbook(file)
+    return pd.ExcelFile(file)
+
+def load_data(file, workers=None, clean=False, engine="xlsx", mapped_only=False):
     """
     Loads data from the specified Excel file, reading only supported sheets.
     Returns a dictionary of {sheet_name: dataframe}.
+
+    With workers > 1, sheets are parsed in a process pool of that many workers.
+    With clean=True, each sheet is also passed through clean_data (in the worker
+    when running in parallel), so merge_sheets yields an already cleaned frame.
+    `engine` picks the reader (see open_workbook). With mapped_only=True the fast
+    reader collects only the columns COLUMN_MAPPING knows: the statistics are
+    the same, but the free-text columns are missing from the frames.
     """
+    with profiling.stage("load_data") as stage:
+        sheets_dict, error = _load_data(file, workers, clean, engine, mapped_only)
+        if sheets_dict:
+            stage.rows_out = sum(len(df) for df in sheets_dict.values())
+    return sheets_dict, error
+
+def _load_data(file, workers, clean, engine, mapped_only):
+    if workers is not None and workers > 1:
+        return _load_data_parallel(file, workers, clean, engine, mapped_only)
+
     try:
-        xls = pd.ExcelFile(file)
+        xls = open_workbook(file, engine)
     except Exception as e:
         return None, f"Error reading Excel file: {str(e)}"
 
     all_data = []
     sheets_found = []
     
-    for sheet_name in xls.sheet_names:
-        try:
-            df = pd.read_excel(xls, sheet_name=sheet_name)
-            df['Source Sheet'] = sheet_name
-            
-            # Normalize columns immediately to handle variations across sheets
-            # We do a partial rename here to help with merging later if needed, 
-            # but main cleaning happens in clean_data
-            all_data.append(df)
-            sheets_found.append(sheet_name)
-        except Exception as e:
-            print(f"Error reading sheet {sheet_name}: {e}")
+    try:
+        for sheet_name in xls.sheet_names:
+            try:
+                df = _read_sheet(xls, sheet_name, clean, mapped_only)
+                
+                # Normalize columns immediately to handle variations across sheets
+                # We do a partial rename here to help with merging later if needed, 
+                # but main cleaning happens in clean_data
+                all_data.append(df)
+                sheets_found.append(sheet_name)
+            except Exception as e:
+                print(f"Error reading sheet {sheet_name}: {e}")
+    finally:
+        xls.close()
 
     if not all_data:
         return {}, "No matching sheets found. Please check the sheet names."
@@ -53,6 +145,178 @@ def load_data(file):
     sheets_dict = {name: df for name, df in zip(sheets_found, all_data)}
     return sheets_dict, None
 
+def _read_sheet(xls, sheet_name, clean, mapped_only=False):
+    with profiling.stage(f"sheet {sheet_name}") as stage:
+        if mapped_only and isinstance(xls, xlsx_reader.XlsxWorkbook):
+            df = xls.parse(sheet_name, usecols=_is_mapped_column)
+        else:
+            df = xls.parse(sheet_name)
+        df['Source Sheet'] = sheet_name
+        if clean:
+            df = clean_data(df)
+        stage.rows_out = len(df)
+    return df
+
+# Workbook opened once per pool worker by _init_sheet_worker (released when the worker exits)
+_worker_workbook = None
+
+def _init_sheet_worker(source, engine):
+    global _worker_workbook
+    _worker_workbook = open_workbook(io.BytesIO(source) if isinstance(source, bytes) else source, engine)
+
+def _load_sheet_task(sheet_name, clean, mapped_only):
+    """
+    Runs in a pool worker. Errors are returned rather than raised so the parent
+    can report them per sheet, like the sequential loop does.
+    """
+    try:
+        return _read_sheet(_worker_workbook, sheet_name, clean, mapped_only), None
+    except Exception as e:
+        return None, e
+
+def _load_data_parallel(file, workers, clean, engine, mapped_only):
+    # Uploaded files are read into bytes once so they can be shipped to the workers
+    if hasattr(file, 'getvalue'):
+        source = file.getvalue()
+    elif hasattr(file, 'read'):
+        source = file.read()
+    else:
+        source = file
+    try:
+        with open_workbook(io.BytesIO(source) if isinstance(source, bytes) else source, engine) as xls:
+            sheet_names = xls.sheet_names
+    except Exception as e:
+        return None, f"Error reading Excel file: {str(e)}"
+
+    sheets_dict = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(sheet_names)) or 1,
+                             initializer=_init_sheet_worker, initargs=(source, engine)) as pool:
+        futures = [pool.submit(_load_sheet_task, name, clean, mapped_only) for name in sheet_names]
+        for sheet_name, future in zip(sheet_names, futures):
+            try:
+                df, error = future.result()
+            except Exception as e:
+                df, error = None, e
+            if error is not None:
+                print(f"Error reading sheet {sheet_name}: {error}")
+                continue
+            sheets_dict[sheet_name] = df
+
+    if not sheets_dict:
+        return {}, "No matching sheets found. Please check the sheet names."
+    return sheets_dict, None
+
+# Rows per chunk in streaming mode
+STREAM_CHUNK_SIZE = 5000
+
+def _header_names(header):
+    """
+    Turns a raw header row into column names the way pd.read_excel does:
+    blank cells become "Unnamed: i" and repeated names get ".1", ".2" suffixes.
+    """
+    header = list(header)
+    while header and header[-1] is None:
+        header.pop()
+
+    names = []
+    seen = {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def iter_sheet_chunks(file, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Streams every sheet of the workbook as (sheet_name, DataFrame) chunks of at most
+    chunk_size rows, using openpyxl's read-only mode so no sheet is ever held in full.
+    Chunks carry the sheet's own header and a 'Source Sheet' column, like load_data.
+    """
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                continue
+            columns = _header_names(header)
+            width = len(columns)
+            blank_row = (None,) * width
+
+            buffer = []
+            pending_blank = 0
+            for row in rows:
+                row = tuple(row[:width]) + (None,) * (width - len(row))
+                if row == blank_row:
+                    # pd.read_excel drops trailing blank rows but keeps interior ones
+                    pending_blank += 1
+                    continue
+                if pending_blank:
+                    buffer.extend([blank_row] * pending_blank)
+                    pending_blank = 0
+                buffer.append(row)
+                if len(buffer) >= chunk_size:
+                    yield sheet.title, _chunk_frame(buffer, columns, sheet.title)
+                    buffer = []
+            if buffer:
+                yield sheet.title, _chunk_frame(buffer, columns, sheet.title)
+    finally:
+        workbook.close()
+
+def _chunk_frame(rows, columns, sheet_name):
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    df['Source Sheet'] = sheet_name
+    return df
+
+def _row_hashes(df):
+    """
+    64-bit content hashes of cleaned rows. Values are hashed by their text, with numbers
+    as floats and every missing value alike, so a row hashes the same whichever dtype its
+    chunk happened to infer for a column.
+    """
+    text = {}
+    for col in df.columns:
+        values = df[col]
+        missing = values.isna()
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            values = values.astype('float64')
+        text[col] = values.astype(str).where(~missing, '')
+    return pd.util.hash_pandas_object(pd.DataFrame(text), index=False).to_numpy()
+
+def stream_statistics(file, chunk_size=STREAM_CHUNK_SIZE, approximate=False):
+    """
+    Computes the statistics dictionary straight from the workbook without loading
+    whole sheets. Each chunk is cleaned with clean_data and folded into a
+    StatisticsState; duplicate rows are dropped across chunks by content hash, per
+    sheet, as clean_data does on the merged frame (rows from different sheets never
+    match on 'Source Sheet'). The hash set grows with the distinct rows of the
+    sheet being read (8 bytes each) and is dropped when the next sheet starts.
+    With approximate, an ApproximateStatisticsState (sketches.py) is used instead.
+    Returns (stats, error) in the style of load_data.
+    """
+    state = ApproximateStatisticsState() if approximate else StatisticsState()
+    current_sheet = None
+    seen = HashSet()
+    try:
+        for sheet_name, chunk in iter_sheet_chunks(file, chunk_size):
+            if sheet_name != current_sheet:
+                current_sheet = sheet_name
+                seen = HashSet()
+
+            chunk = clean_data(chunk)
+            if chunk.empty:
+                continue
+            hashes = _row_hashes(chunk[[col for col in DEDUP_COLUMNS if col in chunk.columns]])
+            state.update(chunk[seen.add(hashes)])
+    except Exception as e:
+        return None, f"Error reading Excel file: {str(e)}"
+
+    return state.to_dict(), None
+
 def merge_sheets(sheets_dict):
     """
     Merges all sheets in the dictionary into a single DataFrame.
@@ -60,162 +324,466 @@ def merge_sheets(sheets_dict):
     if not sheets_dict:
         return pd.DataFrame()
         
-    return pd.concat(sheets_dict.values(), ignore_index=True)
+    with profiling.stage("merge_sheets", rows_in=sum(len(df) for df in sheets_dict.values())) as stage:
+        # Standard headers first, so sheets that spell a column differently
+        # ("State" / "College State") line up in one column
+        frames = []
+        for df in sheets_dict.values():
+            schema = resolve_schema(tuple(df.columns))
+            if schema.columns != tuple(df.columns):
+                df = df.iloc[:, list(schema.keep)]
+                df.columns = list(schema.columns)
+            frames.append(df)
+        df = pd.concat(frames, ignore_index=True)
+        stage.rows_out = len(df)
+    return df
+
+# Low-cardinality text columns that clean_data stores as categoricals
+CATEGORICAL_COLUMNS = ["College Name", "State", "City", "Domain", "All Girls", "Reviewed By", "Source Sheet"]
 
-def clean_data(df):
+def compact_dtypes(df):
+    """
+    Converts a cleaned DataFrame to its compact form: categoricals for the
+    low-cardinality text columns (All Girls keeps its original "Yes"/"No"
+    values) and the smallest integer type for an integer Team Strength.
+    Values and their exported text are unchanged; float Team Strength stays
+    float so "4.0" is not written as "4". Columns already converted are left alone,
+    and so is a Reviewed By column that mixes text with numbers or other values.
+    """
+    df = df.copy(deep=False)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            if col == 'Reviewed By' and pd.api.types.infer_dtype(df[col], skipna=True) not in ('string', 'empty'):
+                continue
+            df[col] = df[col].astype('category')
+    if 'Team Strength' in df.columns and pd.api.types.is_integer_dtype(df['Team Strength']):
+        df['Team Strength'] = pd.to_numeric(df['Team Strength'], downcast='integer')
+    return df
+
+def memory_report(df):
+    """
+    Returns bytes per column of a cleaned DataFrame as loaded and in compact form,
+    as a DataFrame with 'before', 'after' and 'ratio' columns plus a total row.
+    """
+    before = df.memory_usage(deep=True, index=False)
+    after = compact_dtypes(df).memory_usage(deep=True, index=False)
+    report = pd.DataFrame({"before": before, "after": after})
+    report.loc["Total"] = report.sum()
+    report["ratio"] = (report["before"] / report["after"]).round(1)
+    return report
+
+def clean_data(df, compact=True):
     """
     Cleans and normalizes the DataFrame.
+    With compact=True (the default) the result uses the dtypes from compact_dtypes.
     """
     if df.empty:
         return df
 
-    # Drop rows where all elements are missing
-    df = df.dropna(how='all')
+    with profiling.stage("clean_data", rows_in=len(df)) as stage:
+        # Drop rows where all elements are missing
+        with profiling.stage("drop empty rows", rows_in=len(df)) as step:
+            df = df.dropna(how='all')
+            step.rows_out = len(df)
 
-    # 1. Normalize Column Names
-    # Create a map that handles case insensitivity if needed, but for now use the direct mapping
-    # We iterate through columns and try to map them
-    
-    new_columns = {}
-    for col in df.columns:
-        # Check if this column maps to one of our standard columns
-        # We check exact match in keys
-        if col in COLUMN_MAPPING:
-            new_columns[col] = COLUMN_MAPPING[col]
-        else:
-            # Try case insensitive match
-            for key, val in COLUMN_MAPPING.items():
-                if str(col).lower() == key.lower():
-                    new_columns[col] = val
-                    break
-    
-    df = df.rename(columns=new_columns)
-    
-    # Remove duplicate columns (keep first occurrence)
-    df = df.loc[:, ~df.columns.duplicated()]
-    
-    # 2. Ensure all standard columns exist
-    standard_cols = ["Team Name", "College Name", "State", "Domain", "Team Strength", "All Girls", "City", "Reviewed By"]
-    for col in standard_cols:
-        if col not in df.columns:
+        # 1. Normalize Column Names (resolved once per distinct header)
+        schema = resolve_schema(tuple(df.columns))
+        df = df.iloc[:, list(schema.keep)]
+        df.columns = list(schema.columns)
+        
+        # 2. Ensure all standard columns exist
+        for col in schema.missing:
             df[col] = None
-            
-    # 3. Data Type Conversion and Filling
-    df['Team Strength'] = pd.to_numeric(df['Team Strength'], errors='coerce').fillna(1)
-    
-    # 4. Value Normalization
-    df['College Name'] = df['College Name'].apply(utils.normalize_college_name)
-    df['State'] = df['State'].apply(utils.normalize_text)
-    df['City'] = df['City'].apply(utils.normalize_text)
-    df['Domain'] = df['Domain'].apply(utils.normalize_text)
-    df['Team Name'] = df['Team Name'].apply(lambda x: str(x).strip() if pd.notna(x) else "Unknown Team")
-    
-    # 5. Deduplication
-    # If a team appears multiple times, we might want to keep the latest or just drop duplicates.
-    # Assuming 'Team Name' + 'College Name' is a unique identifier, or just 'Team Name'.
-    # For now, let's drop exact duplicates across all columns
-    df = df.drop_duplicates()
+                
+        # 3. Data Type Conversion and Filling
+        with profiling.stage("Team Strength"):
+            df['Team Strength'] = pd.to_numeric(df['Team Strength'], errors='coerce').fillna(1)
+        
+        # 4. Value Normalization
+        # Each normalizer runs once per distinct value, backed by a process-wide cache
+        normalizers = [
+            ('College Name', utils.cached_normalize_college_name, compact),
+            ('State', utils.cached_normalize_text, compact),
+            ('City', utils.cached_normalize_text, compact),
+            ('Domain', utils.cached_normalize_text, compact),
+            ('Team Name', lambda x: str(x).strip() if pd.notna(x) else "Unknown Team", False),
+        ]
+        for col, normalizer, categorical in normalizers:
+            with profiling.stage(f"normalize {col}"):
+                df[col] = utils.normalize_column(df[col], normalizer, categorical=categorical)
+        
+        # 5. Deduplication
+        # If a team appears multiple times, we might want to keep the latest or just drop duplicates.
+        # Rows count as duplicates when all standard columns and the source sheet match;
+        # free-text columns outside the schema are not hashed.
+        with profiling.stage("drop duplicates", rows_in=len(df)) as step:
+            df = df.drop_duplicates(subset=list(schema.dedup_columns))
+            step.rows_out = len(df)
+
+        # 6. Compact dtypes (after deduplication, which hashes the plain values)
+        if compact:
+            with profiling.stage("compact dtypes"):
+                df = compact_dtypes(df)
+        stage.rows_out = len(df)
     
     return df
 
-def generate_statistics(df):
+
+# --- Columnar snapshots ---
+# A snapshot is the merged, cleaned frame written as Parquet or Feather, so later
+# runs can skip the workbook entirely.
+
+SNAPSHOT_FORMATS = {".parquet": "parquet", ".feather": "feather", ".arrow": "feather"}
+
+def _snapshot_format(path):
+    suffix = os.path.splitext(str(path))[1].lower()
+    if suffix not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unsupported snapshot format '{suffix}'. Use one of: {', '.join(SNAPSHOT_FORMATS)}")
+    return SNAPSHOT_FORMATS[suffix]
+
+def to_snapshot_frame(df):
     """
-    Generates the comprehensive statistics dictionary.
+    Returns df in the compact dtypes of compact_dtypes, which Arrow stores
+    dictionary-encoded. Columns mixing types (e.g. "Yes" and True) are stored
+    as text.
     """
-    if df.empty:
+    df = df.copy()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            values = df[col].cat.categories
+        elif df[col].dtype == object:
+            values = df[col].dropna()
+        else:
+            continue
+        if len({type(v) for v in values}) > 1:
+            column = df[col].astype(object)
+            df[col] = column.where(column.isna(), column.astype(str))
+    return compact_dtypes(df).reset_index(drop=True)
+
+def write_snapshot(df, path):
+    """
+    Writes a cleaned DataFrame to a .parquet or .feather/.arrow snapshot.
+    Feather snapshots are left uncompressed so they can be memory-mapped on load.
+    """
+    fmt = _snapshot_format(path)
+    df = to_snapshot_frame(df)
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_feather(path, compression="uncompressed")
+
+def load_snapshot(path):
+    """
+    Loads a snapshot written by write_snapshot. Returns (df, error) like load_data.
+    Feather files are memory-mapped, so column buffers are read zero-copy where Arrow allows.
+    """
+    try:
+        fmt = _snapshot_format(path)
+        if fmt == "parquet":
+            df = pd.read_parquet(path, memory_map=True)
+        else:
+            from pyarrow import feather
+            df = feather.read_table(path, memory_map=True).to_pandas()
+    except Exception as e:
+        return None, f"Error reading snapshot: {str(e)}"
+    return df, None
+
+def workbook_to_snapshot(file, path, workers=None):
+    """
+    Loads, merges and cleans a workbook once and stores the result as a snapshot.
+    Returns an error message, or None on success.
+    """
+    sheets_dict, error = load_data(file, workers=workers)
+    if error:
+        return error
+    try:
+        write_snapshot(clean_data(merge_sheets(sheets_dict)), path)
+    except Exception as e:
+        return f"Error writing snapshot: {str(e)}"
+    return None
+
+
+# --- Vectorized statistics engine ---
+# Every section below is computed with one grouped aggregation per dimension;
+# the only Python loops left are the ones that build the output dictionaries.
+
+def _split_lists(keys, values):
+    """
+    Turns two aligned Series, already sorted so equal keys are contiguous,
+    into a dictionary of {key: [values...]}.
+    """
+    keys = keys.to_numpy()
+    values = values.to_numpy()
+    if len(keys) == 0:
         return {}
-        
-    stats = {}
-    
-    # --- Overall Statistics ---
-    stats['overall_statistics'] = {
+    boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    chunks = np.split(values, boundaries)
+    return dict(zip(keys[starts].tolist(), (chunk.tolist() for chunk in chunks)))
+
+def _grouped_unique(df, key, col):
+    """
+    Unique values of `col` per `key`, in order of first appearance (like Series.unique()).
+    """
+    pairs = df[[key, col]].drop_duplicates()
+    pairs = pairs[pairs[key].notna()].sort_values(key, kind='stable')
+    return _split_lists(pairs[key], pairs[col])
+
+def _grouped_top_k(df, key, col, k):
+    """
+    The `k` most frequent values of `col` per `key`, matching
+    group[col].value_counts().head(k): count descending, ties by first appearance.
+    """
+    counts = df.groupby([key, col], sort=False, observed=True).size().reset_index(name='_count')
+    counts['_order'] = np.arange(len(counts))
+    counts = counts.sort_values([key, '_count', '_order'], ascending=[True, False, True], kind='stable')
+    top = counts.groupby(key, sort=False, observed=True).head(k)
+    return _split_lists(top[key], top[col])
+
+# Columns that are grouped on or counted; factorizing them once up front lets
+# every aggregation below work on integer codes instead of rehashing strings.
+STATISTICS_KEY_COLUMNS = ["Team Name", "College Name", "State", "City", "Domain", "Reviewed By"]
+
+def _factorize_keys(df):
+    """
+    Returns a shallow copy of df with the statistics key columns as categoricals.
+    Columns that are already categorical are left as they are.
+    """
+    df = df.copy(deep=False)
+    for col in STATISTICS_KEY_COLUMNS:
+        if col not in df.columns:
+            continue
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+        elif not df[col].cat.categories.is_monotonic_increasing:
+            # Groupby follows category order; the statistics list groups in sorted order
+            categories = df[col].cat.categories
+            try:
+                ordered = categories.sort_values()
+            except TypeError:
+                # Categories mixing numbers and text
+                ordered = sorted(categories, key=sort_key)
+            df[col] = df[col].cat.reorder_categories(ordered)
+    return df
+
+def _overall_section(df):
+    return {
         "total_teams": int(df['Team Name'].nunique()),
         "total_colleges": int(df['College Name'].nunique()),
         "total_states": int(df['State'].nunique()),
         "total_participants": int(df['Team Strength'].sum()),
-        "all_girls_teams": int(df[df['All Girls'].astype(str).str.lower().isin(['yes', 'true', '1'])].shape[0]),
+        "all_girls_teams": int(df['All Girls'].astype(str).str.lower().isin(['yes', 'true', '1']).sum()),
         "review_status": {
-            "reviewed": int(df[df['Reviewed By'].notna() & (df['Reviewed By'] != '')].shape[0]),
-            "pending": int(df[df['Reviewed By'].isna() | (df['Reviewed By'] == '')].shape[0])
+            "reviewed": int((df['Reviewed By'].notna() & (df['Reviewed By'] != '')).sum()),
+            "pending": int((df['Reviewed By'].isna() | (df['Reviewed By'] == '')).sum())
         }
     }
-    
-    # --- College Wise Statistics ---
-    college_stats = []
-    college_groups = df.groupby('College Name')
-    for name, group in college_groups:
-        college_stats.append({
-            "college_name": name,
-            "total_teams": int(group['Team Name'].nunique()),
-            "total_participants": int(group['Team Strength'].sum()),
-            "domains": list(group['Domain'].unique()),
-            "cities": list(group['City'].unique())
-        })
-    
-    # Sort by total teams desc
-    college_stats.sort(key=lambda x: x['total_teams'], reverse=True)
-    
-    stats['college_wise_statistics'] = {
-        "all_colleges": college_stats, # Return all
-        "colleges_with_single_team": int(sum(1 for c in college_stats if c['total_teams'] == 1)),
-        "unique_colleges_list": [c['college_name'] for c in college_stats]
-    }
-    
-    # --- Domain Wise Distribution ---
-    # Mapping domains to the requested keys if possible, or just using raw domains
-    # The prompt asks for specific keys: edu_tech, healthcare, fin_tech, open, sus_green_tech
-    # We will try to categorize, or just return all domains found.
-    # Let's do a dynamic approach but try to map to the requested structure if names match.
-    
-    domain_groups = df.groupby('Domain')
+
+def _college_section(df):
+    agg = df.groupby('College Name', observed=True).agg(
+        total_teams=('Team Name', 'nunique'),
+        total_participants=('Team Strength', 'sum'),
+    )
+    # Stable sort keeps colleges with equal team counts in name order
+    agg = agg.sort_values('total_teams', ascending=False, kind='stable')
+
+    def all_colleges():
+        domains = _grouped_unique(df, 'College Name', 'Domain')
+        cities = _grouped_unique(df, 'College Name', 'City')
+        return [
+            {
+                "college_name": name,
+                "total_teams": int(teams),
+                "total_participants": int(participants),
+                "domains": domains[name],
+                "cities": cities[name]
+            }
+            for name, teams, participants in zip(agg.index.tolist(), agg['total_teams'].tolist(), agg['total_participants'].tolist())
+        ]
+
+    # The per-college domain/city lists and the full name list are the costly parts
+    return LazySections([
+        ("all_colleges", all_colleges),
+        ("colleges_with_single_team", lambda: int((agg['total_teams'] == 1).sum())),
+        ("unique_colleges_list", lambda: agg.index.tolist()),
+    ])
+
+def _domain_section(df):
+    agg = df.groupby('Domain', observed=True).agg(
+        total_teams=('Team Name', 'nunique'),
+        total_participants=('Team Strength', 'sum'),
+    )
+    top_colleges = _grouped_top_k(df, 'Domain', 'College Name', 5)
+
     domain_stats = {}
-    for name, group in domain_groups:
+    for name, teams, participants in zip(agg.index.tolist(), agg['total_teams'].tolist(), agg['total_participants'].tolist()):
         # Normalize key for JSON (e.g., "Edu Tech" -> "edu_tech")
         key = name.lower().replace(" ", "_").replace("-", "_")
-        
-        # Find top colleges for this domain
-        top_colleges = group['College Name'].value_counts().head(5).index.tolist()
-        
         domain_stats[key] = {
-            "total_teams": int(group['Team Name'].nunique()),
-            "total_participants": int(group['Team Strength'].sum()),
-            "top_colleges": top_colleges
+            "total_teams": int(teams),
+            "total_participants": int(participants),
+            "top_colleges": top_colleges[name]
         }
-    stats['domain_wise_distribution'] = domain_stats
-    
-    # --- Geographical Distribution ---
-    state_stats = []
-    for name, group in df.groupby('State'):
-        state_stats.append({
-            "state": name,
-            "total_teams": int(group['Team Name'].nunique()),
-            "total_colleges": int(group['College Name'].nunique()),
-            "top_colleges": group['College Name'].value_counts().head(3).index.tolist()
-        })
-    stats['geographical_distribution'] = {
-        "state_wise": state_stats,
-        "city_wise": [{"city": n, "total_teams": int(g['Team Name'].nunique()), "total_colleges": int(g['College Name'].nunique())} for n, g in df.groupby('City')]
+    return domain_stats
+
+def _geographical_section(df):
+    state_agg = df.groupby('State', observed=True).agg(
+        total_teams=('Team Name', 'nunique'),
+        total_colleges=('College Name', 'nunique'),
+    )
+    top_colleges = _grouped_top_k(df, 'State', 'College Name', 3)
+    city_agg = df.groupby('City', observed=True).agg(
+        total_teams=('Team Name', 'nunique'),
+        total_colleges=('College Name', 'nunique'),
+    )
+    return {
+        "state_wise": [
+            {"state": name, "total_teams": int(teams), "total_colleges": int(colleges), "top_colleges": top_colleges[name]}
+            for name, teams, colleges in zip(state_agg.index.tolist(), state_agg['total_teams'].tolist(), state_agg['total_colleges'].tolist())
+        ],
+        "city_wise": [
+            {"city": name, "total_teams": int(teams), "total_colleges": int(colleges)}
+            for name, teams, colleges in zip(city_agg.index.tolist(), city_agg['total_teams'].tolist(), city_agg['total_colleges'].tolist())
+        ]
     }
-    
-    # --- Team Size Analysis ---
-    stats['team_size_analysis'] = {
-        "solo_teams": int(df[df['Team Strength'] == 1].shape[0]),
-        "small_teams_2_3": int(df[df['Team Strength'].between(2, 3)].shape[0]),
-        "full_teams_4_5": int(df[df['Team Strength'] >= 4].shape[0]),
-        "average_team_size": float(round(df['Team Strength'].mean(), 2)),
-        "largest_team_size": int(df['Team Strength'].max()) if not df.empty else 0
+
+def _team_size_section(df):
+    strength = df['Team Strength']
+    return {
+        "solo_teams": int((strength == 1).sum()),
+        "small_teams_2_3": int(strength.between(2, 3).sum()),
+        "full_teams_4_5": int((strength >= 4).sum()),
+        "average_team_size": float(round(strength.mean(), 2)),
+        "largest_team_size": int(strength.max()) if not df.empty else 0
     }
-    
-    # --- Reviewer Statistics ---
+
+def _reviewer_section(df):
     reviewer_stats = []
     if 'Reviewed By' in df.columns:
-        for name, group in df.groupby('Reviewed By'):
-            if pd.isna(name) or name == "": continue
-            reviewer_stats.append({
-                "reviewer_name": name,
-                "teams_reviewed": int(group.shape[0]),
-                "domains_reviewed": list(group['Domain'].unique())
-            })
-    stats['reviewer_statistics'] = {"by_reviewer": reviewer_stats}
-    
-    return stats
+        reviewed = df[df['Reviewed By'].notna() & (df['Reviewed By'] != '')]
+        counts = reviewed.groupby('Reviewed By', observed=True).size()
+        domains = _grouped_unique(reviewed, 'Reviewed By', 'Domain')
+        reviewer_stats = [
+            {"reviewer_name": name, "teams_reviewed": int(count), "domains_reviewed": domains[name]}
+            for name, count in zip(counts.index.tolist(), counts.tolist())
+        ]
+    return {"by_reviewer": reviewer_stats}
+
+# Top-level keys of the statistics dictionary and the functions computing them, in output order
+STATISTICS_SECTIONS = [
+    ('overall_statistics', _overall_section),
+    ('college_wise_statistics', _college_section),
+    ('domain_wise_distribution', _domain_section),
+    ('geographical_distribution', _geographical_section),
+    ('team_size_analysis', _team_size_section),
+    ('reviewer_statistics', _reviewer_section),
+]
+
+class LazySections(Mapping):
+    """
+    Read-only dictionary whose values are computed on first access and
+    memoized. `sections` is a list of (key, zero-argument function) in output
+    order. Iterating keys or testing membership computes nothing; values(),
+    items() and to_dict() compute every section.
+    """
+
+    def __init__(self, sections):
+        self._compute = dict(sections)
+        self._values = {}
+        # Shared between Streamlit sessions, so each section is computed by one thread only
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        compute = self._compute[key]
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = compute()
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._compute)
+
+    def __len__(self):
+        return len(self._compute)
+
+    def __repr__(self):
+        return f"LazySections(keys={list(self._compute)}, computed={list(self._values)})"
+
+    def computed(self):
+        """
+        Keys whose values have been computed so far.
+        """
+        return [key for key in self._compute if key in self._values]
+
+    def ready(self, key):
+        """
+        True if `key` and every section nested in it are computed, so reading
+        it computes nothing.
+        """
+        if key not in self._values:
+            return False
+        value = self._values[key]
+        return not isinstance(value, LazySections) or all(value.ready(k) for k in value)
+
+    def to_dict(self):
+        """
+        Computes every section and returns the whole thing as plain nested dictionaries.
+        """
+        return materialize(self)
+
+def materialize(value):
+    """
+    Plain nested dictionaries for a value that may be (or hold) LazySections.
+    Sections only nest as direct values, so lists are returned as they are.
+    """
+    if isinstance(value, LazySections):
+        return {key: materialize(value[key]) for key in value}
+    return value
+
+def lazy_statistics(df):
+    """
+    The statistics dictionary of generate_statistics as LazySections: each
+    top-level section (and each college-wise list) is computed when first read.
+    The frame must not change afterwards.
+    """
+    if df.empty:
+        return LazySections([])
+
+    @cache
+    def factorized():
+        with profiling.stage("factorize keys"):
+            return _factorize_keys(df)
+
+    def section(key, func):
+        def compute():
+            frame = factorized()
+            with profiling.stage(key):
+                return func(frame)
+        return key, compute
+
+    return LazySections([section(key, func) for key, func in STATISTICS_SECTIONS])
+
+def iter_statistics(df):
+    """
+    Yields (key, section) pairs of the statistics dictionary in output order,
+    each as soon as it is computed, so callers can show early sections while
+    later ones are still running.
+    """
+    if df.empty:
+        return
+
+    with profiling.stage("generate_statistics", rows_in=len(df)):
+        with profiling.stage("factorize keys"):
+            df = _factorize_keys(df)
+        for key, section in STATISTICS_SECTIONS:
+            with profiling.stage(key):
+                result = materialize(section(df))
+            yield key, result
+
+def generate_statistics(df):
+    """
+    Generates the comprehensive statistics dictionary.
+    """
+    return dict(iter_statistics(df))
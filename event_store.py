@@ -0,0 +1,371 @@
+"""
+Persistent multi-event store: cleaned registrations from many hackathons in one
+SQLite file, tagged by event id, with the statistics and cross-event
+comparisons computed as SQL aggregations.
+
+    python event_store.py events.db ingest registrations.xlsx --event hack-2025
+    python event_store.py events.db list
+    python event_store.py events.db stats hack-2025 -o stats.json
+    python event_store.py events.db compare college --top 20
+"""
+import argparse
+import sqlite3
+import sys
+import time
+
+import pandas as pd
+
+# Rows inserted per executemany call
+INGEST_BATCH_ROWS = 50_000
+
+# Cleaned column -> store column
+STORE_COLUMNS = {
+    "Team Name": "team_name",
+    "College Name": "college_name",
+    "State": "state",
+    "City": "city",
+    "Domain": "domain",
+    "Team Strength": "team_strength",
+    "Reviewed By": "reviewed_by",
+    "Source Sheet": "source_sheet",
+}
+
+# compare() dimensions -> store column
+DIMENSIONS = {"college": "college_name", "domain": "domain", "state": "state", "city": "city"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    name TEXT,
+    ingested_at TEXT,
+    row_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS registrations (
+    id INTEGER PRIMARY KEY,  -- insertion order, used for "first appearance" orderings
+    event_id TEXT NOT NULL,
+    team_name TEXT,
+    college_name TEXT,
+    state TEXT,
+    city TEXT,
+    domain TEXT,
+    team_strength REAL,
+    all_girls INTEGER,
+    reviewed_by TEXT,
+    source_sheet TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_registrations_event ON registrations (event_id);
+CREATE INDEX IF NOT EXISTS idx_registrations_college ON registrations (college_name, event_id, team_name);
+CREATE INDEX IF NOT EXISTS idx_registrations_domain ON registrations (domain, event_id, team_name);
+CREATE INDEX IF NOT EXISTS idx_registrations_state ON registrations (state, event_id, team_name);
+"""
+
+
+def _text(series):
+    """
+    Object array of str values with None for missing ones.
+    """
+    values = series.astype(object)
+    return values.where(values.notna(), None).map(lambda v: v if v is None else str(v))
+
+
+class EventStore:
+    """
+    A SQLite file holding cleaned registrations of many events.
+
+    statistics() returns the same dictionary as data_processor.generate_statistics
+    for one event (or several pooled together); compare() lines events up
+    side by side per college, domain, state or city.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # --- Ingestion ---
+
+    def ingest(self, df, event_id, name=None):
+        """
+        Stores the output of clean_data under `event_id`, replacing any rows the
+        event already had. Returns the number of rows stored.
+        """
+        columns = {}
+        for col, store_col in STORE_COLUMNS.items():
+            if col not in df.columns:
+                columns[store_col] = [None] * len(df)
+            elif col == "Team Strength":
+                columns[store_col] = pd.to_numeric(df[col], errors="coerce").astype(float).tolist()
+            else:
+                columns[store_col] = _text(df[col]).tolist()
+        # Same test as the all_girls_teams statistic
+        girls = df["All Girls"].astype(str).str.lower().isin(["yes", "true", "1"]) if "All Girls" in df.columns \
+            else pd.Series(False, index=df.index)
+        columns["all_girls"] = girls.astype(int).tolist()
+
+        names = list(columns)
+        rows = zip(*(columns[c] for c in names))
+        insert = (f"INSERT INTO registrations (event_id, {', '.join(names)}) "
+                  f"VALUES (?, {', '.join('?' for _ in names)})")
+        with self.conn:
+            self.conn.execute("DELETE FROM registrations WHERE event_id = ?", (event_id,))
+            while True:
+                batch = [(event_id,) + row for _, row in zip(range(INGEST_BATCH_ROWS), rows)]
+                if not batch:
+                    break
+                self.conn.executemany(insert, batch)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO events (event_id, name, ingested_at, row_count) VALUES (?, ?, ?, ?)",
+                (event_id, name or event_id, time.strftime("%Y-%m-%dT%H:%M:%S"), len(df)),
+            )
+        return len(df)
+
+    def ingest_workbook(self, file, event_id, name=None, workers=None):
+        """
+        Loads, merges and cleans a workbook and stores it. Returns (rows, error).
+        """
+        import data_processor
+
+        # Only the standard columns are stored
+        sheets_dict, error = data_processor.load_data(file, workers=workers, mapped_only=True)
+        if error:
+            return None, error
+        df = data_processor.clean_data(data_processor.merge_sheets(sheets_dict))
+        return self.ingest(df, event_id, name), None
+
+    def delete_event(self, event_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM registrations WHERE event_id = ?", (event_id,))
+            self.conn.execute("DELETE FROM events WHERE event_id = ?", (event_id,))
+
+    def events(self):
+        """
+        The stored events as a DataFrame (event_id, name, ingested_at, row_count).
+        """
+        return pd.read_sql_query("SELECT event_id, name, ingested_at, row_count FROM events ORDER BY ingested_at, event_id", self.conn)
+
+    # --- Queries ---
+
+    @staticmethod
+    def _where(events):
+        """
+        SQL filter and parameters for one event id, a list of them, or all events (None).
+        """
+        if events is None:
+            return "", []
+        if isinstance(events, str):
+            events = [events]
+        return f"WHERE event_id IN ({', '.join('?' for _ in events)})", list(events)
+
+    def _query(self, sql, params):
+        return self.conn.execute(sql, params).fetchall()
+
+    def _grouped_unique(self, key, col, where, params):
+        """
+        {key: distinct values of col in order of first appearance}.
+        """
+        result = {}
+        sql = (f"SELECT {key}, {col}, MIN(id) AS first FROM registrations {where} "
+               f"GROUP BY {key}, {col} ORDER BY {key}, first")
+        for k, value, _ in self._query(sql, params):
+            result.setdefault(k, []).append(value)
+        return result
+
+    def _grouped_top_k(self, key, col, k, where, params):
+        """
+        {key: the k most frequent values of col}, ties by first appearance.
+        """
+        result = {}
+        sql = f"""
+            SELECT {key}, {col} FROM (
+                SELECT {key}, {col}, ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY COUNT(*) DESC, MIN(id)) AS rank
+                FROM registrations {where} GROUP BY {key}, {col}
+            ) WHERE rank <= ? ORDER BY {key}, rank"""
+        for key_value, value in self._query(sql, params + [k]):
+            result.setdefault(key_value, []).append(value)
+        return result
+
+    def statistics(self, events=None):
+        """
+        The generate_statistics dictionary for one event, several events pooled
+        together, or every stored event (events=None). Empty if nothing matches.
+        """
+        where, params = self._where(events)
+
+        (rows, teams, colleges, states, participants, girls, reviewed, largest, average,
+         solo, small, full) = self._query(f"""
+            SELECT COUNT(*), COUNT(DISTINCT team_name), COUNT(DISTINCT college_name), COUNT(DISTINCT state),
+                   SUM(team_strength), SUM(all_girls),
+                   SUM(reviewed_by IS NOT NULL AND reviewed_by != ''),
+                   MAX(team_strength), AVG(team_strength),
+                   SUM(team_strength = 1), SUM(team_strength BETWEEN 2 AND 3), SUM(team_strength >= 4)
+            FROM registrations {where}""", params)[0]
+        if not rows:
+            return {}
+
+        stats = {}
+        stats['overall_statistics'] = {
+            "total_teams": int(teams),
+            "total_colleges": int(colleges),
+            "total_states": int(states),
+            "total_participants": int(participants or 0),
+            "all_girls_teams": int(girls),
+            "review_status": {
+                "reviewed": int(reviewed),
+                "pending": int(rows - reviewed)
+            }
+        }
+
+        college_rows = self._query(f"""
+            SELECT college_name, COUNT(DISTINCT team_name) AS teams, SUM(team_strength)
+            FROM registrations {where} GROUP BY college_name ORDER BY teams DESC, college_name""", params)
+        domains = self._grouped_unique("college_name", "domain", where, params)
+        cities = self._grouped_unique("college_name", "city", where, params)
+        stats['college_wise_statistics'] = {
+            "all_colleges": [
+                {
+                    "college_name": name,
+                    "total_teams": int(count),
+                    "total_participants": int(total or 0),
+                    "domains": domains[name],
+                    "cities": cities[name]
+                }
+                for name, count, total in college_rows
+            ],
+            "colleges_with_single_team": sum(1 for _, count, _ in college_rows if count == 1),
+            "unique_colleges_list": [name for name, _, _ in college_rows]
+        }
+
+        top_colleges = self._grouped_top_k("domain", "college_name", 5, where, params)
+        domain_stats = {}
+        for name, count, total in self._query(f"""
+                SELECT domain, COUNT(DISTINCT team_name), SUM(team_strength)
+                FROM registrations {where} GROUP BY domain ORDER BY domain""", params):
+            key = name.lower().replace(" ", "_").replace("-", "_")
+            domain_stats[key] = {
+                "total_teams": int(count),
+                "total_participants": int(total or 0),
+                "top_colleges": top_colleges[name]
+            }
+        stats['domain_wise_distribution'] = domain_stats
+
+        state_top = self._grouped_top_k("state", "college_name", 3, where, params)
+        stats['geographical_distribution'] = {
+            "state_wise": [
+                {"state": name, "total_teams": int(count), "total_colleges": int(college_count), "top_colleges": state_top[name]}
+                for name, count, college_count in self._query(f"""
+                    SELECT state, COUNT(DISTINCT team_name), COUNT(DISTINCT college_name)
+                    FROM registrations {where} GROUP BY state ORDER BY state""", params)
+            ],
+            "city_wise": [
+                {"city": name, "total_teams": int(count), "total_colleges": int(college_count)}
+                for name, count, college_count in self._query(f"""
+                    SELECT city, COUNT(DISTINCT team_name), COUNT(DISTINCT college_name)
+                    FROM registrations {where} GROUP BY city ORDER BY city""", params)
+            ]
+        }
+
+        stats['team_size_analysis'] = {
+            "solo_teams": int(solo),
+            "small_teams_2_3": int(small),
+            "full_teams_4_5": int(full),
+            "average_team_size": float(round(average, 2)),
+            "largest_team_size": int(largest)
+        }
+
+        reviewed_where = (f"{where} AND" if where else "WHERE") + " reviewed_by IS NOT NULL AND reviewed_by != ''"
+        reviewer_domains = self._grouped_unique("reviewed_by", "domain", reviewed_where, params)
+        stats['reviewer_statistics'] = {"by_reviewer": [
+            {"reviewer_name": name, "teams_reviewed": int(count), "domains_reviewed": reviewer_domains[name]}
+            for name, count in self._query(f"""
+                SELECT reviewed_by, COUNT(*) FROM registrations {reviewed_where}
+                GROUP BY reviewed_by ORDER BY reviewed_by""", params)
+        ]}
+        return stats
+
+    def compare(self, dimension, events=None, metric="teams", top=None):
+        """
+        One row per college/domain/state/city and one column per event, holding
+        distinct teams (metric="teams") or participants (metric="participants").
+        Rows are ordered by their total over the selected events; `top` keeps the first rows.
+        """
+        column = DIMENSIONS[dimension]
+        value = "COUNT(DISTINCT team_name)" if metric == "teams" else "SUM(team_strength)"
+        where, params = self._where(events)
+        counts = pd.read_sql_query(
+            f"SELECT {column} AS {dimension}, event_id, {value} AS value FROM registrations {where} "
+            f"GROUP BY {column}, event_id", self.conn, params=params)
+        table = counts.pivot(index=dimension, columns="event_id", values="value").fillna(0).astype(int)
+        table.columns.name = None
+        order = table.sum(axis=1).sort_values(ascending=False, kind="stable").index
+        table = table.loc[order]
+        return table.head(top) if top else table
+
+
+def main():
+    import exporters
+
+    parser = argparse.ArgumentParser(description="Store cleaned registrations of many events and compare them.")
+    parser.add_argument("store", help="SQLite file (created if missing)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser("ingest", help="Load, clean and store a workbook as one event")
+    ingest_parser.add_argument("workbook")
+    ingest_parser.add_argument("--event", required=True, help="Event id (replaces the event if it exists)")
+    ingest_parser.add_argument("--name", help="Display name of the event")
+    ingest_parser.add_argument("--workers", type=int, default=None)
+
+    commands.add_parser("list", help="List stored events")
+
+    stats_parser = commands.add_parser("stats", help="Statistics JSON of one or more events")
+    stats_parser.add_argument("events", nargs="*", help="Event ids (default: all, pooled)")
+    stats_parser.add_argument("-o", "--output", help="Write the JSON here instead of stdout")
+
+    compare_parser = commands.add_parser("compare", help="Compare events per college, domain, state or city")
+    compare_parser.add_argument("dimension", choices=sorted(DIMENSIONS))
+    compare_parser.add_argument("--events", nargs="+", help="Event ids (default: all)")
+    compare_parser.add_argument("--metric", choices=["teams", "participants"], default="teams")
+    compare_parser.add_argument("--top", type=int, default=20)
+
+    delete_parser = commands.add_parser("delete", help="Remove an event")
+    delete_parser.add_argument("event")
+
+    args = parser.parse_args()
+    with EventStore(args.store) as store:
+        if args.command == "ingest":
+            start = time.perf_counter()
+            rows, error = store.ingest_workbook(args.workbook, args.event, args.name, args.workers)
+            if error:
+                print(error, file=sys.stderr)
+                return 1
+            print(f"Stored {rows} rows as {args.event} in {time.perf_counter() - start:.2f}s")
+        elif args.command == "list":
+            print(store.events().to_string(index=False))
+        elif args.command == "stats":
+            stats = store.statistics(args.events or None)
+            if args.output:
+                exporters.export_to_path(exporters.iter_json(stats), args.output)
+            else:
+                for chunk in exporters.iter_json(stats):
+                    sys.stdout.write(chunk)
+                sys.stdout.write("\n")
+        elif args.command == "compare":
+            print(store.compare(args.dimension, args.events, args.metric, args.top).to_string())
+        elif args.command == "delete":
+            store.delete_event(args.event)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Chunked report exports. The iter_* functions yield the text of a CSV, NDJSON or
+statistics JSON export a piece at a time; write_export and iter_bytes encode
+(and optionally gzip) those pieces on the fly, so the full payload never
+exists in memory as one string:
+
+    with open("colleges.csv.gz", "wb") as f:
+        exporters.write_export(exporters.iter_csv(df), f, compress=True)
+"""
+import json
+import os
+import shutil
+import threading
+import zlib
+from collections import OrderedDict
+
+# Rows rendered per CSV/NDJSON chunk
+EXPORT_CHUNK_ROWS = 10_000
+
+# Encoded pieces are gathered up to this size before each write
+WRITE_BUFFER_BYTES = 1 << 16
+
+# Limits of an ExportFiles directory before the least recently used files are deleted
+EXPORT_FILE_ENTRIES = 64
+EXPORT_DISK_BYTES = 1 << 30
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "ndjson": ("application/x-ndjson", ".ndjson"),
+    "json": ("application/json", ".json"),
+}
+
+
+def iter_csv(df, chunk_size=EXPORT_CHUNK_ROWS):
+    """
+    Yields the CSV text of the frame (header first, no index) `chunk_size` rows at a time.
+    The concatenation equals df.to_csv(index=False).
+    """
+    yield df.iloc[:0].to_csv(index=False)
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size].to_csv(index=False, header=False)
+
+
+def iter_ndjson(df, chunk_size=EXPORT_CHUNK_ROWS):
+    """
+    Yields one JSON object per row and line, `chunk_size` rows at a time.
+    """
+    for start in range(0, len(df), chunk_size):
+        text = df.iloc[start:start + chunk_size].to_json(orient="records", lines=True, force_ascii=False)
+        yield text if text.endswith("\n") else text + "\n"
+
+
+def iter_json(data, indent=2):
+    """
+    Yields the JSON text of `data` as the encoder produces it.
+    The concatenation equals json.dumps(data, indent=indent).
+    """
+    return json.JSONEncoder(indent=indent).iterencode(data)
+
+
+def iter_bytes(chunks, compress=False, encoding="utf-8", buffer_size=WRITE_BUFFER_BYTES):
+    """
+    Encodes text chunks and yields byte blocks of about `buffer_size`, gzip
+    compressed on the fly when `compress` is set. Suitable as a streaming
+    response body.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+    pending, size = [], 0
+    for chunk in chunks:
+        data = chunk.encode(encoding)
+        pending.append(data)
+        size += len(data)
+        if size >= buffer_size:
+            block = b"".join(pending)
+            pending, size = [], 0
+            block = compressor.compress(block) if compressor else block
+            if block:
+                yield block
+    block = b"".join(pending)
+    if compressor:
+        block = compressor.compress(block) + compressor.flush()
+    if block:
+        yield block
+
+
+def write_export(chunks, file, compress=False, encoding="utf-8"):
+    """
+    Writes text chunks to a binary file-like object (optionally gzipped).
+    Returns the number of bytes written.
+    """
+    written = 0
+    for block in iter_bytes(chunks, compress=compress, encoding=encoding):
+        file.write(block)
+        written += len(block)
+    return written
+
+
+def export_to_path(chunks, path, compress=None):
+    """
+    Writes an export to `path`, gzipped when compress is set or, by default,
+    when the path ends in .gz. The file is written under a temporary name and
+    renamed when complete. Returns the number of bytes written.
+    """
+    if compress is None:
+        compress = path.endswith(".gz")
+    partial = path + ".partial"
+    with open(partial, "wb") as f:
+        written = write_export(chunks, f, compress=compress)
+    os.replace(partial, path)
+    return written
+
+
+def export_filename(name, fmt, compress=False):
+    """
+    File name for a download: "college_summary" + csv -> "college_summary.csv(.gz)".
+    """
+    return name + EXPORT_FORMATS[fmt][1] + (".gz" if compress else "")
+
+
+def export_mime(fmt, compress=False):
+    return "application/gzip" if compress else EXPORT_FORMATS[fmt][0]
+
+
+class ExportFiles:
+    """
+    Export files kept in one directory and keyed by (dataset key, file name).
+    Beyond `max_files` files or `max_bytes` on disk, the least recently used
+    files are deleted, so the directory does not grow without bound.
+    """
+
+    def __init__(self, directory, max_files=EXPORT_FILE_ENTRIES, max_bytes=EXPORT_DISK_BYTES):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._files = OrderedDict()  # (key, name) -> (path, size)
+        self._lock = threading.Lock()
+
+    def write(self, key, name, make_chunks, compress=False):
+        """
+        Returns the path of the export, writing make_chunks() to it first unless
+        it is already on disk.
+        """
+        with self._lock:
+            entry = self._files.get((key, name))
+            if entry is not None and os.path.exists(entry[0]):
+                self._files.move_to_end((key, name))
+                return entry[0]
+            path = os.path.join(self.directory, f"{key}_{name}")
+            size = export_to_path(make_chunks(), path, compress=compress)
+            self._files[(key, name)] = (path, size)
+            self._evict(keep=(key, name))
+        return path
+
+    def _evict(self, keep):
+        total = sum(size for _, size in self._files.values())
+        for entry_key in list(self._files):
+            if len(self._files) <= self.max_files and total <= self.max_bytes:
+                break
+            if entry_key == keep:
+                continue
+            path, size = self._files.pop(entry_key)
+            total -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        Deletes every export file and the directory.
+        """
+        with self._lock:
+            self._files.clear()
+            shutil.rmtree(self.directory, ignore_errors=True)
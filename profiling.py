@@ -0,0 +1,242 @@
+"""
+Stage timing for the analysis pipeline.
+
+load_data, merge_sheets, clean_data and generate_statistics mark their stages
+with profiling.stage(). Nothing is recorded unless a profile is active:
+
+    with profiling.profile() as report:
+        sheets_dict, error = data_processor.load_data(path)
+        ...
+    print(report.to_frame())
+
+    python profiling.py registrations.xlsx --memory -o profile.json
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# The PipelineProfile recording in the current thread/context, if any.
+# A ContextVar keeps concurrent Streamlit sessions from recording into each other's profiles.
+_ACTIVE = ContextVar("active_profile", default=None)
+
+
+class _NullStage:
+    """
+    Returned by stage() while no profile is active: entering, leaving and
+    setting rows_out do nothing.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    @property
+    def rows_out(self):
+        return None
+
+    @rows_out.setter
+    def rows_out(self, value):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profile", "record", "start", "memory_start", "peak")
+
+    def __init__(self, profile, record):
+        self.profile = profile
+        self.record = record
+
+    @property
+    def rows_out(self):
+        return self.record["rows_out"]
+
+    @rows_out.setter
+    def rows_out(self, value):
+        self.record["rows_out"] = int(value)
+
+    def __enter__(self):
+        self.profile._open(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record["seconds"] = time.perf_counter() - self.start
+        self.profile._close(self)
+        return False
+
+
+class PipelineProfile:
+    """
+    The stages recorded while a profile was active, in the order they started.
+
+    Each record holds the stage path ("clean_data/normalize State"), its depth,
+    wall time in seconds, rows in and out (None where a stage does not change
+    the row count) and, with memory=True, the peak traced memory above the
+    stage's starting point in bytes. Memory tracing uses tracemalloc, which
+    sees Python and NumPy allocations (not Arrow buffers) and slows the
+    pipeline down noticeably, so it is off by default.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.records = []
+        self._open_stages = []
+        self.seconds = 0.0
+
+    def _stage(self, name, rows_in):
+        path = "/".join([s.record["stage"] for s in self._open_stages[-1:]] + [name])
+        record = {
+            "stage": path,
+            "depth": len(self._open_stages),
+            "seconds": None,
+            "rows_in": None if rows_in is None else int(rows_in),
+            "rows_out": None,
+            "peak_memory_delta": None,
+        }
+        self.records.append(record)
+        return _Stage(self, record)
+
+    def _open(self, stage):
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Fold the enclosing stage's peak so far before the counter is reset for this one
+            if self._open_stages:
+                parent = self._open_stages[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            stage.memory_start = current
+            stage.peak = current
+        self._open_stages.append(stage)
+
+    def _close(self, stage):
+        self._open_stages.pop()
+        if self.memory:
+            stage.peak = max(stage.peak, tracemalloc.get_traced_memory()[1])
+            stage.record["peak_memory_delta"] = stage.peak - stage.memory_start
+            if self._open_stages:
+                parent = self._open_stages[-1]
+                parent.peak = max(parent.peak, stage.peak)
+
+    def to_dict(self):
+        return {"seconds": self.seconds, "memory": self.memory, "stages": [dict(r) for r in self.records]}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_frame(self):
+        """
+        The records as a DataFrame, one row per stage.
+        """
+        import pandas as pd
+        frame = pd.DataFrame(self.records, columns=["stage", "depth", "seconds", "rows_in", "rows_out", "peak_memory_delta"])
+        return frame.astype({"rows_in": "Int64", "rows_out": "Int64", "peak_memory_delta": "Int64"})
+
+
+def stage(name, rows_in=None):
+    """
+    Context manager marking one pipeline stage. Set `.rows_out` on the returned
+    object to record the rows a stage produced. Costs one ContextVar lookup when
+    no profile is active.
+    """
+    profile = _ACTIVE.get()
+    if profile is None:
+        return _NULL_STAGE
+    return profile._stage(name, rows_in)
+
+
+@contextmanager
+def profile(memory=False, enabled=True):
+    """
+    Records every stage run inside the block into the PipelineProfile it yields.
+    With enabled=False nothing is recorded and None is yielded, so callers can
+    keep a single code path.
+    """
+    if not enabled:
+        yield None
+        return
+    report = PipelineProfile(memory=memory)
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    token = _ACTIVE.set(report)
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report.seconds = time.perf_counter() - start
+        _ACTIVE.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def peak_rss_mb():
+    """
+    Peak resident memory of this process in MB, for the benchmarks that run
+    each measurement in a fresh process.
+    """
+    # VmHWM is reset by exec, unlike ru_maxrss which a spawned child inherits on Linux
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def profile_pipeline(file, memory=False):
+    """
+    Runs load_data -> merge_sheets -> clean_data -> generate_statistics on one
+    workbook under a profile. Returns ((stats, PipelineProfile), error).
+    """
+    import data_processor
+
+    with profile(memory=memory) as report:
+        sheets_dict, error = data_processor.load_data(file)
+        if error:
+            return None, error
+        df = data_processor.clean_data(data_processor.merge_sheets(sheets_dict))
+        stats = data_processor.generate_statistics(df)
+    return (stats, report), None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the analysis pipeline stage by stage on one workbook.")
+    parser.add_argument("workbook")
+    parser.add_argument("--memory", action="store_true", help="Also record peak memory per stage (slower)")
+    parser.add_argument("-o", "--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    result, error = profile_pipeline(args.workbook, memory=args.memory)
+    if error:
+        print(error, file=sys.stderr)
+        return 1
+    _, report = result
+
+    frame = report.to_frame()
+    names = ["  " * depth + path.rsplit("/", 1)[-1] for depth, path in zip(frame["depth"], frame["stage"])]
+    frame["stage"] = [name.ljust(max(map(len, names))) for name in names]
+    print(frame.drop(columns="depth").to_string(index=False))
+    print(f"total {report.seconds:.3f}s")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report.to_json())
+    return 0
+
+
+if __name__ == "__main__":
+    # data_processor imports this file as `profiling`; run that module so both share one _ACTIVE
+    import profiling
+    sys.exit(profiling.main())
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# Columns with fewer distinct values than this get a multiselect; the rest get a text search
+CATEGORICAL_LIMIT = 20
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class RawDataIndex:
+    """
+    Filtering structures for the Raw Data view, built once per cleaned DataFrame:
+
+    - an inverted index (value -> sorted row ids) for every low-cardinality column,
+    - a lowercase text column for every other column, searched as a plain substring.
+
+    filter() combines the active filters as boolean bitmaps and returns matching
+    row ids; page() slices one window of rows out of the frame for display.
+    """
+
+    def __init__(self, df, categorical_limit=CATEGORICAL_LIMIT):
+        self.df = df
+        self.columns = list(df.columns)
+        self.postings = {}  # column -> {value as text: row ids}
+        self.options = {}   # column -> sorted values for the multiselect
+        self.text = {}      # column -> lowercase text of every row
+
+        for column in self.columns:
+            values = df[column]
+            if values.nunique() < categorical_limit:
+                codes, uniques = pd.factorize(values)
+                order = np.argsort(codes, kind='stable')
+                bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+                postings = {}
+                for code, value in enumerate(uniques):
+                    # Values that print the same (e.g. 1 and "1") share one option
+                    ids = order[bounds[code]:bounds[code + 1]]
+                    key = str(value)
+                    postings[key] = np.union1d(postings[key], ids) if key in postings else ids
+                self.postings[column] = postings
+                self.options[column] = sorted(postings)
+            else:
+                self.text[column] = values.astype(str).str.lower()
+
+    def is_categorical(self, column):
+        return column in self.postings
+
+    def filter(self, selections=None, searches=None):
+        """
+        Returns the row ids matching every filter. `selections` maps categorical
+        columns to the values to keep; `searches` maps text columns to a
+        case-insensitive substring.
+        """
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, selected in (selections or {}).items():
+            if not selected:
+                continue
+            bitmap = np.zeros(len(self.df), dtype=bool)
+            postings = self.postings[column]
+            for value in selected:
+                if value in postings:
+                    bitmap[postings[value]] = True
+            mask &= bitmap
+        for column, term in (searches or {}).items():
+            if not term:
+                continue
+            mask &= self.text[column].str.contains(term.lower(), regex=False, na=False).to_numpy(dtype=bool)
+        return np.flatnonzero(mask)
+
+    def page(self, ids, page=1, page_size=DEFAULT_PAGE_SIZE):
+        """
+        Returns rows ids[(page - 1) * page_size : page * page_size] of the frame.
+        """
+        start = (max(page, 1) - 1) * page_size
+        return self.df.iloc[ids[start:start + page_size]]
+
+    @staticmethod
+    def page_count(ids, page_size=DEFAULT_PAGE_SIZE):
+        return max(1, -(-len(ids) // page_size))
@@ -0,0 +1,380 @@
+"""
+Fixed-size, mergeable sketches for an approximate statistics mode on very
+large registration histories:
+
+- HyperLogLogCounter: distinct counts (teams overall and per group, colleges
+  per state and city). Same add/merge/total/counts interface as
+  statistics_state.DistinctCounter, but a fixed number of registers per group
+  instead of a hash per distinct member.
+- CountMinSketch and SpaceSaving, combined in TopK: the most frequent
+  colleges per domain and per state without a full count per college.
+
+ApproximateStatisticsState uses them in place of the exact per-group
+structures of StatisticsState and renders the same statistics dictionary.
+
+Error bounds (N = rows folded into the group, n = true distinct count):
+- HyperLogLog with 2**p registers: relative standard error 1.04 / sqrt(2**p),
+  so 0.81% for the overall team count (p=14, 16 KiB), 2.3% per domain and
+  state (p=11, 2 KiB) and 6.5% per college and city (p=8, 256 bytes). Counts well below 2**p are estimated by linear counting
+  and are close to exact.
+- Count-Min with width w and depth d: estimates never undercount and
+  overcount by at most e / w * N with probability 1 - exp(-d), i.e.
+  0.13% of N with probability 98% for w=2048, d=4.
+- Space-Saving with c counters: every item occurring more than N / c times
+  is kept, and kept counts overcount by at most N / c. Both hold after any
+  number of merges.
+
+All sketches merge by combining their arrays, so states built per sheet,
+per batch or per process can be folded together in any order.
+"""
+import numpy as np
+import pandas as pd
+
+from statistics_state import StatisticsState, _add_ordered
+
+# Registers (2**precision) of the overall HyperLogLog, of the per-domain and
+# per-state ones (few groups) and of the per-college and per-city ones (many groups)
+OVERALL_PRECISION = 14
+REGION_PRECISION = 11
+GROUP_PRECISION = 8
+
+# Count-Min table size and Space-Saving counters of each TopK
+CMS_WIDTH = 2048
+CMS_DEPTH = 4
+TOPK_CAPACITY = 64
+
+# Odd multipliers deriving independent Count-Min row hashes from one 64-bit hash
+_ROW_MULTIPLIERS = np.array([
+    0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93,
+    0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53, 0x94D049BB133111EB, 0xBF58476D1CE4E5B9,
+], dtype=np.uint64)
+
+
+def hash_values(values):
+    """
+    64-bit hashes of a Series or array of values (pandas' hash_array, like DistinctCounter).
+    """
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _leading_zeros(x):
+    """
+    Leading zero bits of each uint64 (64 for zero), by binary search on shifts.
+    """
+    x = x.copy()
+    zeros = np.zeros(len(x), dtype=np.uint8)
+    for shift in (32, 16, 8, 4, 2, 1):
+        empty = (x >> np.uint64(64 - shift)) == 0
+        zeros[empty] += shift
+        x[empty] <<= np.uint64(shift)
+    zeros[x == 0] += 1
+    return zeros
+
+
+def _estimate(registers):
+    """
+    HyperLogLog estimate per row of a (groups, 2**p) register array.
+    """
+    m = registers.shape[1]
+    alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+    raw = alpha * m * m / np.exp2(-registers.astype(np.float64)).sum(axis=1)
+    empty = (registers == 0).sum(axis=1)
+    # Linear counting for small cardinalities, where the raw estimate is biased
+    small = (raw <= 2.5 * m) & (empty > 0)
+    with np.errstate(divide="ignore"):
+        linear = m * np.log(m / np.maximum(empty, 1))
+    return np.where(small, linear, raw)
+
+
+class HyperLogLogCounter:
+    """
+    Approximate distinct members per group with one HyperLogLog (2**precision
+    one-byte registers) per group. A drop-in for DistinctCounter: add(members,
+    groups=None), merge(other), total() and counts() (rounded estimates).
+    """
+
+    def __init__(self, precision=GROUP_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros((0, 1 << precision), dtype=np.uint8)
+        self.names = []
+        self._ids = {}
+
+    def add(self, members, groups=None):
+        """
+        Adds the non-missing members of a Series, optionally grouped by an aligned Series.
+        """
+        mask = members.notna()
+        if groups is not None:
+            mask &= groups.notna()
+            groups = groups[mask]
+        members = members[mask]
+        if not len(members):
+            return self
+
+        if groups is None:
+            ids = np.full(len(members), self._id(None), dtype=np.int64)
+        else:
+            codes, uniques = pd.factorize(groups)
+            ids = np.array([self._id(name) for name in uniques.tolist()], dtype=np.int64)[codes]
+        self._add_hashes(hash_values(members), ids)
+        return self
+
+    def merge(self, other):
+        """
+        Folds in another counter of the same precision (register-wise maximum).
+        """
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge HyperLogLogs of precision {self.precision} and {other.precision}")
+        if not other.names:
+            return self
+        ids = np.array([self._id(name) for name in other.names], dtype=np.int64)
+        np.maximum.at(self.registers, ids, other.registers[:len(other.names)])
+        return self
+
+    def _id(self, name):
+        group_id = self._ids.get(name)
+        if group_id is None:
+            group_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+            if group_id >= len(self.registers):
+                grown = np.zeros((max(4, 2 * len(self.registers)), self.registers.shape[1]), dtype=np.uint8)
+                grown[:len(self.registers)] = self.registers
+                self.registers = grown
+        return group_id
+
+    def _add_hashes(self, hashes, ids):
+        p = self.precision
+        buckets = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        rank = np.minimum(_leading_zeros(hashes << np.uint64(p)) + 1, 64 - p + 1).astype(np.uint8)
+        np.maximum.at(self.registers.reshape(-1), ids * (1 << p) + buckets, rank)
+
+    def total(self):
+        return int(round(float(_estimate(self.registers[:len(self.names)]).sum())))
+
+    def counts(self):
+        """
+        Returns {group: estimated distinct member count}.
+        """
+        estimates = np.rint(_estimate(self.registers[:len(self.names)])).astype(np.int64)
+        return dict(zip(self.names, estimates.tolist()))
+
+
+class CountMinSketch:
+    """
+    Frequency estimates for any item in a fixed depth x width table of counts.
+    Estimates are never below the true count.
+    """
+
+    def __init__(self, width=CMS_WIDTH, depth=CMS_DEPTH):
+        if width & (width - 1) or not 0 < depth <= len(_ROW_MULTIPLIERS):
+            raise ValueError("width must be a power of two and depth at most 8")
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    def _columns(self, hashes):
+        shift = np.uint64(64 - (self.width.bit_length() - 1))
+        return [((hashes * multiplier) >> shift).astype(np.int64) for multiplier in _ROW_MULTIPLIERS[:self.depth]]
+
+    def add(self, hashes, counts):
+        for row, columns in enumerate(self._columns(hashes)):
+            np.add.at(self.table[row], columns, counts)
+        self.total += int(counts.sum())
+        return self
+
+    def estimate(self, hashes):
+        return np.min([self.table[row][columns] for row, columns in enumerate(self._columns(hashes))], axis=0)
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge Count-Min sketches of different sizes")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+
+class SpaceSaving:
+    """
+    The `capacity` most frequent items seen so far with overestimated counts
+    (Space-Saving). Batches and other summaries are folded in with the
+    mergeable-summaries rule: an item missing from a full summary may have
+    occurred up to that summary's smallest count.
+    """
+
+    def __init__(self, capacity=TOPK_CAPACITY):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype=np.int64)
+
+    def _floor(self):
+        return int(self.counts.min()) if len(self.counts) >= self.capacity else 0
+
+    def _combine(self, counts, floor):
+        items = self.counts.index.union(counts.index, sort=False)
+        combined = self.counts.reindex(items, fill_value=self._floor()) + counts.reindex(items, fill_value=floor)
+        # Stable, so ties keep first-appearance order
+        self.counts = combined.sort_values(ascending=False, kind="stable").iloc[:self.capacity]
+        return self
+
+    def add(self, counts):
+        """
+        Folds in exact counts of one batch (a Series indexed by item).
+        """
+        return self._combine(counts.astype(np.int64), 0)
+
+    def merge(self, other):
+        return self._combine(other.counts, other._floor())
+
+
+class TopK:
+    """
+    Most frequent items of one group: Space-Saving keeps the candidates, and
+    each candidate is ranked by the lower of its Space-Saving count and its
+    Count-Min estimate (both overcount, so the lower one is closer).
+    """
+
+    def __init__(self, capacity=TOPK_CAPACITY, width=CMS_WIDTH, depth=CMS_DEPTH):
+        self.candidates = SpaceSaving(capacity)
+        self.frequencies = CountMinSketch(width, depth)
+
+    def add(self, counts):
+        """
+        Folds in exact counts of one batch (a Series indexed by item).
+        """
+        self.candidates.add(counts)
+        self.frequencies.add(hash_values(counts.index), counts.to_numpy(dtype=np.int64))
+        return self
+
+    def merge(self, other):
+        self.candidates.merge(other.candidates)
+        self.frequencies.merge(other.frequencies)
+        return self
+
+    def top(self, k):
+        counts = self.candidates.counts
+        if counts.empty:
+            return []
+        estimates = np.minimum(counts.to_numpy(), self.frequencies.estimate(hash_values(counts.index)))
+        order = np.argsort(-estimates, kind="stable")[:k]
+        return counts.index[order].tolist()
+
+
+def _add_top_k(sketches, df, key, col):
+    """
+    Folds per-`key` occurrence counts of `col` into sketches[key] (a TopK).
+    """
+    counts = df.groupby([key, col], sort=False, observed=True).size()
+    for name, group in counts.groupby(level=0, sort=False):
+        sketch = sketches.get(name)
+        if sketch is None:
+            sketch = sketches[name] = TopK()
+        sketch.add(group.droplevel(0))
+
+
+def _merge_top_k(ours, theirs):
+    for name, sketch in theirs.items():
+        if name in ours:
+            ours[name].merge(sketch)
+        else:
+            ours[name] = TopK().merge(sketch)
+
+
+class ApproximateStatisticsState(StatisticsState):
+    """
+    StatisticsState with sketches wherever the exact state grows with the data:
+    HyperLogLogs count distinct teams (overall and per college, domain, state
+    and city) and distinct colleges per state and city, and a TopK per domain
+    and state finds the top colleges. Memory per group is fixed; the
+    per-college domain/city lists and the state, domain and city names stay
+    exact, since the statistics list them anyway.
+
+    update(df), merge(other), save()/load() and to_dict() work as in
+    StatisticsState; to_dict() adds an "approximate" entry with the error bounds.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.teams = HyperLogLogCounter(OVERALL_PRECISION)
+        self.college_teams = HyperLogLogCounter()
+        self.domain_teams = HyperLogLogCounter(REGION_PRECISION)
+        self.state_teams = HyperLogLogCounter(REGION_PRECISION)
+        self.city_teams = HyperLogLogCounter()
+        self.state_colleges = HyperLogLogCounter(REGION_PRECISION)
+        self.city_colleges = HyperLogLogCounter()
+        self.domain_top_colleges = {}
+        self.state_top_colleges = {}
+
+    def _update_domains(self, df):
+        sums = df.groupby('Domain', sort=False, observed=True)['Team Strength'].sum()
+        for name, participants in zip(sums.index.tolist(), sums.tolist()):
+            entry = self.domains.get(name)
+            if entry is None:
+                entry = self.domains[name] = {"participants": 0.0, "colleges": {}}
+            entry["participants"] += participants
+        self.domain_teams.add(df['Team Name'], df['Domain'])
+        _add_top_k(self.domain_top_colleges, df, 'Domain', 'College Name')
+
+    def _update_geography(self, df):
+        for name in df['State'].dropna().unique().tolist():
+            if name not in self.states:
+                self.states[name] = {"colleges": {}}
+        self.state_teams.add(df['Team Name'], df['State'])
+        self.state_colleges.add(df['College Name'], df['State'])
+        _add_top_k(self.state_top_colleges, df, 'State', 'College Name')
+
+        for name in df['City'].dropna().unique().tolist():
+            if name not in self.cities:
+                self.cities[name] = {"colleges": set()}
+        self.city_teams.add(df['Team Name'], df['City'])
+        self.city_colleges.add(df['College Name'], df['City'])
+
+    def merge(self, other):
+        super().merge(other)
+        self.state_colleges.merge(other.state_colleges)
+        self.city_colleges.merge(other.city_colleges)
+        _merge_top_k(self.domain_top_colleges, other.domain_top_colleges)
+        _merge_top_k(self.state_top_colleges, other.state_top_colleges)
+        return self
+
+    def to_dict(self):
+        """
+        The statistics dictionary of StatisticsState.to_dict(), with estimated
+        team counts, college counts per state and city, and top colleges.
+        """
+        stats = super().to_dict()
+        if not stats:
+            return stats
+
+        for name in self.domains:
+            key = name.lower().replace(" ", "_").replace("-", "_")
+            sketch = self.domain_top_colleges.get(name)
+            stats['domain_wise_distribution'][key]["top_colleges"] = sketch.top(5) if sketch else []
+        state_colleges = self.state_colleges.counts()
+        for entry in stats['geographical_distribution']['state_wise']:
+            sketch = self.state_top_colleges.get(entry["state"])
+            entry["total_colleges"] = state_colleges.get(entry["state"], 0)
+            entry["top_colleges"] = sketch.top(3) if sketch else []
+        city_colleges = self.city_colleges.counts()
+        for entry in stats['geographical_distribution']['city_wise']:
+            entry["total_colleges"] = city_colleges.get(entry["city"], 0)
+
+        stats['approximate'] = {
+            "distinct_count_relative_error": {
+                "overall": round(1.04 / (1 << OVERALL_PRECISION) ** 0.5, 4),
+                "per_domain_and_state": round(1.04 / (1 << REGION_PRECISION) ** 0.5, 4),
+                "per_college_and_city": round(1.04 / (1 << GROUP_PRECISION) ** 0.5, 4),
+            },
+            # Bounds on the overcount of a top college's count, for a group of N rows
+            "top_colleges_overcount": {
+                "space_saving": f"N/{TOPK_CAPACITY}",
+                "count_min": f"{np.e / CMS_WIDTH:.2%} of N with probability {1 - np.exp(-CMS_DEPTH):.0%}",
+            },
+        }
+        return stats
+
+
+def approximate_statistics(df):
+    """
+    The statistics dictionary of a cleaned DataFrame in approximate mode.
+    """
+    return ApproximateStatisticsState().update(df).to_dict()
@@ -0,0 +1,61 @@
+import argparse
+import sys
+import time
+
+import data_processor
+import exporters
+
+
+def convert(args):
+    start = time.perf_counter()
+    error = data_processor.workbook_to_snapshot(args.workbook, args.snapshot, workers=args.workers)
+    if error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f"Wrote {args.snapshot} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def analyze(args):
+    start = time.perf_counter()
+    df, error = data_processor.load_snapshot(args.snapshot)
+    if error:
+        print(error, file=sys.stderr)
+        return 1
+    if args.sheet:
+        df = df[df['Source Sheet'] == args.sheet]
+    loaded = time.perf_counter()
+    stats = data_processor.generate_statistics(df)
+    print(f"Loaded {len(df)} rows in {loaded - start:.3f}s, statistics in {time.perf_counter() - loaded:.3f}s", file=sys.stderr)
+
+    if args.output:
+        exporters.export_to_path(exporters.iter_json(stats), args.output)
+    else:
+        for chunk in exporters.iter_json(stats):
+            sys.stdout.write(chunk)
+        sys.stdout.write("\n")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert workbooks to columnar snapshots and analyze them.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = commands.add_parser("convert", help="Load, clean and store a workbook as .parquet or .feather")
+    convert_parser.add_argument("workbook")
+    convert_parser.add_argument("snapshot")
+    convert_parser.add_argument("--workers", type=int, default=None, help="Parse sheets in this many processes")
+    convert_parser.set_defaults(func=convert)
+
+    analyze_parser = commands.add_parser("analyze", help="Print the statistics JSON of a snapshot")
+    analyze_parser.add_argument("snapshot")
+    analyze_parser.add_argument("--sheet", help="Only analyze rows from this source sheet")
+    analyze_parser.add_argument("-o", "--output", help="Write the JSON here instead of stdout (gzipped if it ends in .gz)")
+    analyze_parser.set_defaults(func=analyze)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,452 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+
+# Odd 64-bit constant used to mix a group hash with a member hash
+_PAIR_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def sort_key(name):
+    """
+    Sort key for group names that may mix numbers and text (e.g. an
+    un-normalized Reviewed By column): numbers first, then text, the order
+    pandas gives such categories.
+    """
+    return (isinstance(name, str), name)
+
+
+def _pair_hashes(groups, members):
+    member_hashes = pd.util.hash_array(np.asarray(members, dtype=object))
+    if groups is None:
+        return member_hashes
+    return pd.util.hash_array(np.asarray(groups, dtype=object)) * _PAIR_MIX ^ member_hashes
+
+
+class DistinctCounter:
+    """
+    Counts distinct members per group (e.g. teams per college). Each distinct
+    (group, member) pair is kept as a 64-bit hash plus a group id, about
+    12 bytes per pair, instead of a Python set of strings.
+
+    Hashes live in sorted runs that are merged like a binary counter (each run is
+    more than twice the size of the next), so adding a batch costs time in
+    proportion to the batch, not to everything counted so far.
+    """
+
+    def __init__(self):
+        self.runs = []  # [(sorted unique keys, group ids)], disjoint from each other
+        self.names = []
+        self._ids = {}
+
+    def add(self, members, groups=None):
+        """
+        Adds the non-missing members of a Series, optionally grouped by an aligned Series.
+        """
+        mask = members.notna()
+        if groups is not None:
+            mask &= groups.notna()
+            groups = groups[mask]
+        members = members[mask]
+        if not len(members):
+            return self
+
+        if groups is None:
+            ids = np.full(len(members), self._id(None), dtype=np.int32)
+        else:
+            codes, uniques = pd.factorize(groups)
+            ids = np.array([self._id(name) for name in uniques.tolist()], dtype=np.int32)[codes]
+        self._insert(_pair_hashes(groups, members), ids)
+        return self
+
+    def merge(self, other):
+        """
+        Adds every pair counted by another DistinctCounter.
+        """
+        if not other.names:
+            return self
+        id_map = np.array([self._id(name) for name in other.names], dtype=np.int32)
+        for keys, ids in other.runs:
+            self._insert(keys, id_map[ids])
+        return self
+
+    def _id(self, name):
+        group_id = self._ids.get(name)
+        if group_id is None:
+            group_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return group_id
+
+    def _insert(self, keys, ids):
+        keys, first = np.unique(keys, return_index=True)
+        ids = ids[first]
+        for run_keys, _ in self.runs:
+            if not len(keys):
+                return
+            positions = np.searchsorted(run_keys, keys)
+            found = run_keys[np.minimum(positions, len(run_keys) - 1)] == keys
+            keys, ids = keys[~found], ids[~found]
+        if not len(keys):
+            return
+
+        self.runs.append((keys, ids))
+        while len(self.runs) > 1 and len(self.runs[-2][0]) <= 2 * len(self.runs[-1][0]):
+            (older_keys, older_ids), (newer_keys, newer_ids) = self.runs.pop(-2), self.runs.pop()
+            keys = np.concatenate([older_keys, newer_keys])
+            order = np.argsort(keys, kind='stable')
+            self.runs.append((keys[order], np.concatenate([older_ids, newer_ids])[order]))
+
+    def total(self):
+        return sum(len(keys) for keys, _ in self.runs)
+
+    def counts(self):
+        """
+        Returns {group: distinct member count}.
+        """
+        totals = np.zeros(len(self.names), dtype=np.int64)
+        for _, ids in self.runs:
+            totals += np.bincount(ids, minlength=len(self.names))
+        return dict(zip(self.names, totals.tolist()))
+
+
+class HashSet:
+    """
+    A set of 64-bit hashes in the sorted-run layout of DistinctCounter: runs
+    are merged like a binary counter, so adding a batch costs time in
+    proportion to the batch (times the log of the number of runs), not to
+    everything added so far. Memory is 8 bytes per distinct hash.
+    """
+
+    def __init__(self):
+        self.runs = []  # sorted unique hashes, disjoint from each other
+
+    def add(self, hashes):
+        """
+        Adds a batch of hashes. Returns a mask of the entries not seen before
+        (the first occurrence of each within the batch).
+        """
+        keys, first = np.unique(hashes, return_index=True)
+        is_new = np.ones(len(keys), dtype=bool)
+        for run in self.runs:
+            positions = np.searchsorted(run, keys)
+            is_new &= run[np.minimum(positions, len(run) - 1)] != keys
+        mask = np.zeros(len(hashes), dtype=bool)
+        mask[first[is_new]] = True
+
+        keys = keys[is_new]
+        if len(keys):
+            self.runs.append(keys)
+            while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+                newer, older = self.runs.pop(), self.runs.pop()
+                self.runs.append(np.sort(np.concatenate([older, newer]), kind='stable'))
+        return mask
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+
+class StatisticsState:
+    """
+    Running counters behind generate_statistics, folded in one cleaned chunk at a time.
+    Memory grows with the number of distinct teams, colleges, cities and so on,
+    not with the number of rows seen.
+
+    States are mergeable: update(df) folds in a new batch, merge(other) combines two
+    states as if their rows had been concatenated (self's rows first), and to_dict()
+    renders the usual statistics dictionary. save()/load() persist a state between runs.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.teams = DistinctCounter()
+        self.total_participants = 0.0
+        self.all_girls_teams = 0
+        self.reviewed = 0
+        self.pending = 0
+
+        # Dictionaries double as ordered sets: insertion order is first appearance,
+        # which is the order Series.unique() and value_counts() ties use.
+        self.colleges = {}   # name -> {"participants": float, "domains": dict, "cities": dict}
+        self.domains = {}    # name -> {"participants": float, "colleges": {college: count}}
+        self.states = {}     # name -> {"colleges": {college: count}}
+        self.cities = {}     # name -> {"colleges": set}
+        self.reviewers = {}  # name -> {"teams_reviewed": int, "domains": dict}
+
+        # Distinct teams per college, domain, state and city
+        self.college_teams = DistinctCounter()
+        self.domain_teams = DistinctCounter()
+        self.state_teams = DistinctCounter()
+        self.city_teams = DistinctCounter()
+
+        self.solo_teams = 0
+        self.small_teams = 0
+        self.full_teams = 0
+        self.strength_sum = 0.0
+        self.strength_count = 0
+        self.strength_max = None
+
+    def update(self, df):
+        """
+        Folds a cleaned DataFrame (output of clean_data) into the state.
+        """
+        if df.empty:
+            return self
+
+        self.rows += len(df)
+        strength = df['Team Strength']
+        reviewed_mask = df['Reviewed By'].notna() & (df['Reviewed By'] != '')
+
+        self.teams.add(df['Team Name'])
+        self.total_participants += float(strength.sum())
+        self.all_girls_teams += int(df['All Girls'].astype(str).str.lower().isin(['yes', 'true', '1']).sum())
+        self.reviewed += int(reviewed_mask.sum())
+        self.pending += int((df['Reviewed By'].isna() | (df['Reviewed By'] == '')).sum())
+
+        self._update_colleges(df)
+        self._update_domains(df)
+        self._update_geography(df)
+        self._update_team_sizes(strength)
+        self._update_reviewers(df[reviewed_mask])
+        return self
+
+    def merge(self, other):
+        """
+        Folds another state into this one, as if other's rows came after ours.
+        """
+        self.rows += other.rows
+        self.teams.merge(other.teams)
+        self.total_participants += other.total_participants
+        self.all_girls_teams += other.all_girls_teams
+        self.reviewed += other.reviewed
+        self.pending += other.pending
+
+        for name, theirs in other.colleges.items():
+            entry = self.colleges.setdefault(name, {"participants": 0.0, "domains": {}, "cities": {}})
+            entry["participants"] += theirs["participants"]
+            _merge_ordered(entry["domains"], theirs["domains"])
+            _merge_ordered(entry["cities"], theirs["cities"])
+        for name, theirs in other.domains.items():
+            entry = self.domains.setdefault(name, {"participants": 0.0, "colleges": {}})
+            entry["participants"] += theirs["participants"]
+            _merge_counts(entry["colleges"], theirs["colleges"])
+        for name, theirs in other.states.items():
+            _merge_counts(self.states.setdefault(name, {"colleges": {}})["colleges"], theirs["colleges"])
+        for name, theirs in other.cities.items():
+            self.cities.setdefault(name, {"colleges": set()})["colleges"].update(theirs["colleges"])
+        for name, theirs in other.reviewers.items():
+            entry = self.reviewers.setdefault(name, {"teams_reviewed": 0, "domains": {}})
+            entry["teams_reviewed"] += theirs["teams_reviewed"]
+            _merge_ordered(entry["domains"], theirs["domains"])
+
+        self.college_teams.merge(other.college_teams)
+        self.domain_teams.merge(other.domain_teams)
+        self.state_teams.merge(other.state_teams)
+        self.city_teams.merge(other.city_teams)
+
+        self.solo_teams += other.solo_teams
+        self.small_teams += other.small_teams
+        self.full_teams += other.full_teams
+        self.strength_sum += other.strength_sum
+        self.strength_count += other.strength_count
+        if other.strength_max is not None and (self.strength_max is None or other.strength_max > self.strength_max):
+            self.strength_max = other.strength_max
+        return self
+
+    def save(self, path):
+        """
+        Writes the state to disk so later batches can be folded in without the old rows.
+        """
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a state written by save(). Only load files you wrote yourself (pickle).
+        """
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if not isinstance(state, cls):
+            raise TypeError(f"{path} does not contain a {cls.__name__}")
+        return state
+
+    def _update_colleges(self, df):
+        sums = df.groupby('College Name', sort=False, observed=True)['Team Strength'].sum()
+        for name, participants in zip(sums.index.tolist(), sums.tolist()):
+            entry = self.colleges.get(name)
+            if entry is None:
+                entry = self.colleges[name] = {"participants": 0.0, "domains": {}, "cities": {}}
+            entry["participants"] += participants
+        self.college_teams.add(df['Team Name'], df['College Name'])
+        _add_ordered(self.colleges, df, 'College Name', 'Domain', "domains")
+        _add_ordered(self.colleges, df, 'College Name', 'City', "cities")
+
+    def _update_domains(self, df):
+        sums = df.groupby('Domain', sort=False, observed=True)['Team Strength'].sum()
+        for name, participants in zip(sums.index.tolist(), sums.tolist()):
+            entry = self.domains.get(name)
+            if entry is None:
+                entry = self.domains[name] = {"participants": 0.0, "colleges": {}}
+            entry["participants"] += participants
+        self.domain_teams.add(df['Team Name'], df['Domain'])
+        _add_counts(self.domains, df, 'Domain', 'College Name', "colleges")
+
+    def _update_geography(self, df):
+        for name in df['State'].dropna().unique().tolist():
+            if name not in self.states:
+                self.states[name] = {"colleges": {}}
+        self.state_teams.add(df['Team Name'], df['State'])
+        _add_counts(self.states, df, 'State', 'College Name', "colleges")
+
+        for name in df['City'].dropna().unique().tolist():
+            if name not in self.cities:
+                self.cities[name] = {"colleges": set()}
+        self.city_teams.add(df['Team Name'], df['City'])
+        _add_pairs(self.cities, df, 'City', 'College Name', "colleges")
+
+    def _update_team_sizes(self, strength):
+        self.solo_teams += int((strength == 1).sum())
+        self.small_teams += int(strength.between(2, 3).sum())
+        self.full_teams += int((strength >= 4).sum())
+        self.strength_sum += float(strength.sum())
+        self.strength_count += int(strength.count())
+        chunk_max = strength.max()
+        if pd.notna(chunk_max) and (self.strength_max is None or chunk_max > self.strength_max):
+            self.strength_max = chunk_max
+
+    def _update_reviewers(self, reviewed):
+        counts = reviewed.groupby('Reviewed By', sort=False, observed=True).size()
+        for name, count in zip(counts.index.tolist(), counts.tolist()):
+            entry = self.reviewers.get(name)
+            if entry is None:
+                entry = self.reviewers[name] = {"teams_reviewed": 0, "domains": {}}
+            entry["teams_reviewed"] += count
+        _add_ordered(self.reviewers, reviewed, 'Reviewed By', 'Domain', "domains")
+
+    def to_dict(self):
+        """
+        Renders the state in the same format as generate_statistics.
+        """
+        if not self.rows:
+            return {}
+
+        college_teams = self.college_teams.counts()
+        domain_teams = self.domain_teams.counts()
+        state_teams = self.state_teams.counts()
+        city_teams = self.city_teams.counts()
+
+        college_stats = [
+            {
+                "college_name": name,
+                "total_teams": college_teams.get(name, 0),
+                "total_participants": int(entry["participants"]),
+                "domains": list(entry["domains"]),
+                "cities": list(entry["cities"])
+            }
+            for name, entry in sorted(self.colleges.items(), key=lambda item: item[0])
+        ]
+        college_stats.sort(key=lambda x: x['total_teams'], reverse=True)
+
+        domain_stats = {}
+        for name, entry in sorted(self.domains.items(), key=lambda item: item[0]):
+            key = name.lower().replace(" ", "_").replace("-", "_")
+            domain_stats[key] = {
+                "total_teams": domain_teams.get(name, 0),
+                "total_participants": int(entry["participants"]),
+                "top_colleges": _top_k(entry["colleges"], 5)
+            }
+
+        return {
+            'overall_statistics': {
+                "total_teams": self.teams.total(),
+                "total_colleges": len(self.colleges),
+                "total_states": len(self.states),
+                "total_participants": int(self.total_participants),
+                "all_girls_teams": self.all_girls_teams,
+                "review_status": {
+                    "reviewed": self.reviewed,
+                    "pending": self.pending
+                }
+            },
+            'college_wise_statistics': {
+                "all_colleges": college_stats,
+                "colleges_with_single_team": int(sum(1 for c in college_stats if c['total_teams'] == 1)),
+                "unique_colleges_list": [c['college_name'] for c in college_stats]
+            },
+            'domain_wise_distribution': domain_stats,
+            'geographical_distribution': {
+                "state_wise": [
+                    {
+                        "state": name,
+                        "total_teams": state_teams.get(name, 0),
+                        "total_colleges": len(entry["colleges"]),
+                        "top_colleges": _top_k(entry["colleges"], 3)
+                    }
+                    for name, entry in sorted(self.states.items(), key=lambda item: item[0])
+                ],
+                "city_wise": [
+                    {"city": name, "total_teams": city_teams.get(name, 0), "total_colleges": len(entry["colleges"])}
+                    for name, entry in sorted(self.cities.items(), key=lambda item: item[0])
+                ]
+            },
+            'team_size_analysis': {
+                "solo_teams": self.solo_teams,
+                "small_teams_2_3": self.small_teams,
+                "full_teams_4_5": self.full_teams,
+                "average_team_size": float(round(self.strength_sum / self.strength_count, 2)) if self.strength_count else float('nan'),
+                "largest_team_size": int(self.strength_max) if self.strength_max is not None else 0
+            },
+            'reviewer_statistics': {
+                "by_reviewer": [
+                    {"reviewer_name": name, "teams_reviewed": entry["teams_reviewed"], "domains_reviewed": list(entry["domains"])}
+                    for name, entry in sorted(self.reviewers.items(), key=lambda item: sort_key(item[0]))
+                ]
+            }
+        }
+
+
+def _pairs(df, key, col, dropna=True):
+    pairs = df[[key, col]].drop_duplicates()
+    if dropna:
+        pairs = pairs.dropna()
+    else:
+        pairs = pairs[pairs[key].notna()]
+    return zip(pairs[key].tolist(), pairs[col].tolist())
+
+def _add_pairs(groups, df, key, col, field):
+    """
+    Adds the distinct non-missing `col` values of each `key` to groups[key][field] (a set).
+    """
+    for name, value in _pairs(df, key, col):
+        groups[name][field].add(value)
+
+def _add_ordered(groups, df, key, col, field):
+    """
+    Appends unseen `col` values of each `key` to groups[key][field], keeping first appearance order.
+    Missing values are kept, as Series.unique() keeps them.
+    """
+    for name, value in _pairs(df, key, col, dropna=False):
+        groups[name][field].setdefault(value, None)
+
+def _add_counts(groups, df, key, col, field):
+    """
+    Adds per-`key` occurrence counts of `col` values to groups[key][field].
+    """
+    counts = df.groupby([key, col], sort=False, observed=True).size()
+    for (name, value), count in zip(counts.index.tolist(), counts.tolist()):
+        field_counts = groups[name][field]
+        field_counts[value] = field_counts.get(value, 0) + count
+
+def _merge_ordered(ours, theirs):
+    for value in theirs:
+        ours.setdefault(value, None)
+
+def _merge_counts(ours, theirs):
+    for value, count in theirs.items():
+        ours[value] = ours.get(value, 0) + count
+
+def _top_k(counts, k):
+    """
+    The k most frequent entries, ties in first appearance order (like value_counts().head(k)).
+    """
+    return [name for name, _ in sorted(counts.items(), key=lambda item: -item[1])[:k]]
@@ -0,0 +1,225 @@
+"""
+Synthetic registration data for the benchmarks and verify scripts:
+
+- write_workbook: raw workbooks that look like portal exports, with
+  misspelled and abbreviated college names, inconsistent casing, header
+  variants from COLUMN_MAPPING, shuffled column order and repeated rows.
+- write_registrations_workbook: plain workbooks with the standard headers.
+- make_registrations: an already-cleaned registration frame.
+- make_names: college name spellings with known misspellings.
+
+    python synthetic_workbook.py registrations.xlsx --rows 100000 --sheets 5 --typo-rate 0.05
+"""
+import argparse
+import random
+import string
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from data_processor import COLUMN_MAPPING, STANDARD_COLUMNS
+from utils import COLLEGE_MAPPINGS
+
+DOMAINS = ["Edu Tech", "Health-Care", "Fin Tech", "Open", "Sus Green Tech"]
+STATES = ["Tamil Nadu", "Kerala", "Karnataka", "Maharashtra", "Delhi", "Telangana", "Andhra Pradesh"]
+REVIEWERS = ["Alice", "Bob", "Carol", "Dave", None]
+SUFFIXES = ["Engineering College", "College of Engineering", "Institute of Technology", "Arts and Science College", "University"]
+
+# Reviewer values of make_registrations: cleaned data also has blank reviewers
+_CLEANED_REVIEWERS = ["Alice", "Bob", "Carol", "Dave", "", None]
+
+# Every header COLUMN_MAPPING accepts for each standard column
+HEADER_VARIANTS = {col: [key for key, value in COLUMN_MAPPING.items() if value == col] for col in STANDARD_COLUMNS}
+
+
+def _word(rng):
+    consonants, vowels = "bcdghjklmnprstvy", "aeiou"
+    return "".join(rng.choice(consonants) + rng.choice(vowels) for _ in range(rng.randint(3, 5))).title()
+
+
+def _typo(rng, name):
+    i = rng.randrange(1, len(name) - 1)
+    kind = rng.choice(["swap", "drop", "insert", "replace"])
+    if kind == "swap":
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    if kind == "drop":
+        return name[:i] + name[i + 1:]
+    if kind == "insert":
+        return name[:i] + rng.choice(string.ascii_lowercase) + name[i:]
+    return name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]
+
+
+def make_names(distinct, typo_share=0.3, seed=0):
+    """
+    Returns (raw names, true college of each name): `distinct` different spellings,
+    of which about `typo_share` are misspellings of another college's name.
+    """
+    rng = random.Random(seed)
+    n_colleges = int(distinct * (1 - typo_share))
+    colleges = list({f"{_word(rng)} {_word(rng)} {rng.choice(SUFFIXES)}" for _ in range(n_colleges)})
+    names, truth = list(colleges), list(range(len(colleges)))
+    while len(names) < distinct:
+        target = rng.randrange(len(colleges))
+        names.append(_typo(rng, colleges[target]))
+        truth.append(target)
+    return names, truth
+
+
+def make_registrations(rows, seed=0):
+    """
+    Builds a synthetic, already-cleaned registration frame with `rows` rows.
+    College and city cardinality grow with the row count like real exports do.
+    """
+    rng = np.random.default_rng(seed)
+    n_colleges = max(10, rows // 40)
+    n_cities = max(5, rows // 400)
+    df = pd.DataFrame({
+        "Team Name": [f"Team {i}" for i in rng.integers(0, max(1, rows * 9 // 10), rows)],
+        "College Name": [f"College {i}" for i in rng.zipf(1.3, rows) % n_colleges],
+        "State": rng.choice(STATES, rows),
+        "Domain": rng.choice(DOMAINS, rows),
+        "Team Strength": rng.integers(1, 6, rows).astype(float),
+        "All Girls": rng.choice(["Yes", "No"], rows, p=[0.15, 0.85]),
+        "City": [f"City {i}" for i in rng.integers(0, n_cities, rows)],
+        "Reviewed By": rng.choice(_CLEANED_REVIEWERS, rows),
+        "Source Sheet": rng.choice(["Early Bird", "Round 1"], rows),
+    })
+    return df
+
+
+def write_registrations_workbook(path, rows, sheets, seed=0):
+    """
+    Writes the make_registrations rows to a workbook with the standard headers,
+    spread over `sheets` sheets. About 2% of rows are repeated so deduplication
+    has work to do.
+    """
+    df = make_registrations(rows, seed=seed).drop(columns=["Source Sheet"])
+    df = df.astype(object).where(df.notna(), None)
+    records = list(df.itertuples(index=False, name=None))
+    records += records[: rows // 50]
+
+    workbook = openpyxl.Workbook(write_only=True)
+    per_sheet = -(-len(records) // sheets)
+    for i in range(sheets):
+        sheet = workbook.create_sheet(f"Round {i + 1}")
+        sheet.append(list(df.columns))
+        for record in records[i * per_sheet:(i + 1) * per_sheet]:
+            sheet.append(record)
+    workbook.save(path)
+
+
+def _messy(rng, value):
+    """
+    The same value as a person might type it: odd casing or stray whitespace.
+    """
+    kind = rng.randrange(4)
+    if kind == 0:
+        return value.lower()
+    if kind == 1:
+        return value.upper()
+    if kind == 2:
+        return f"  {value} "
+    return value.replace(" ", "  ")
+
+
+def make_records(unique, typo_rate=0.05, seed=0):
+    """
+    Returns `unique` raw registration records (tuples in STANDARD_COLUMNS order).
+    About `typo_rate` of the college names are misspelled, abbreviated or
+    oddly cased. College and city cardinality grow with the row count like
+    real exports do.
+    """
+    rng = random.Random(seed)
+    nprng = np.random.default_rng(seed)
+
+    n_colleges = max(10, unique // 40)
+    colleges = list({f"{_word(rng)} {_word(rng)} {rng.choice(SUFFIXES)}" for _ in range(n_colleges)})
+    colleges += sorted(set(COLLEGE_MAPPINGS.values()))
+    aliases = list(COLLEGE_MAPPINGS)
+    n_cities = max(5, unique // 400)
+
+    college_ids = nprng.zipf(1.3, unique) % len(colleges)
+    college_names = [colleges[i] for i in college_ids.tolist()]
+    for i in np.flatnonzero(nprng.random(unique) < typo_rate).tolist():
+        kind = rng.randrange(3)
+        if kind == 0:
+            college_names[i] = _typo(rng, college_names[i])
+        elif kind == 1:
+            college_names[i] = _messy(rng, college_names[i])
+        else:
+            college_names[i] = rng.choice(aliases)
+
+    columns = {
+        "Team Name": [f"Team {i}" for i in nprng.integers(0, max(1, unique * 9 // 10), unique).tolist()],
+        "College Name": college_names,
+        "State": nprng.choice(STATES, unique).tolist(),
+        "Domain": nprng.choice(DOMAINS, unique).tolist(),
+        "Team Strength": nprng.integers(1, 6, unique).tolist(),
+        "All Girls": nprng.choice(["Yes", "No"], unique, p=[0.15, 0.85]).tolist(),
+        "City": [f"City {i}" for i in nprng.integers(0, n_cities, unique).tolist()],
+        "Reviewed By": [REVIEWERS[i] for i in nprng.integers(0, len(REVIEWERS), unique).tolist()],
+    }
+    return list(zip(*(columns[col] for col in STANDARD_COLUMNS)))
+
+
+def sheet_header(sheet_index, rng, header_variants=True):
+    """
+    The (header, column order) of one sheet. With header_variants, sheets cycle
+    through the COLUMN_MAPPING spellings, some in upper case, in a shuffled order.
+    """
+    order = list(range(len(STANDARD_COLUMNS)))
+    if not header_variants:
+        return list(STANDARD_COLUMNS), order
+    rng.shuffle(order)
+    header = []
+    for position in order:
+        variants = HEADER_VARIANTS[STANDARD_COLUMNS[position]]
+        name = variants[sheet_index % len(variants)]
+        header.append(name.upper() if sheet_index % 3 == 2 else name)
+    return header, order
+
+
+def write_workbook(path, rows, sheets=5, typo_rate=0.05, header_variants=True, duplicate_rate=0.02, seed=0):
+    """
+    Writes a synthetic raw registration workbook with `rows` rows spread over
+    `sheets` sheets ("Round 1", "Round 2", ...). Repeated rows stay within
+    their sheet, so clean_data treats them as duplicates.
+    """
+    rng = random.Random(seed)
+    duplicates = int(rows * duplicate_rate)
+    unique = make_records(rows - duplicates, typo_rate, seed)
+    workbook = openpyxl.Workbook(write_only=True)
+    per_sheet = -(-len(unique) // sheets)
+    for i in range(sheets):
+        records = unique[i * per_sheet:(i + 1) * per_sheet]
+        if not records:
+            break
+        extra = duplicates // sheets + (i < duplicates % sheets)
+        records += [rng.choice(records) for _ in range(extra)]
+        rng.shuffle(records)
+        header, order = sheet_header(i, rng, header_variants)
+        sheet = workbook.create_sheet(f"Round {i + 1}")
+        sheet.append(header)
+        for record in records:
+            sheet.append([record[position] for position in order])
+    workbook.save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic raw registration workbook.")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--sheets", type=int, default=5)
+    parser.add_argument("--typo-rate", type=float, default=0.05, help="Share of misspelled/abbreviated college names")
+    parser.add_argument("--duplicate-rate", type=float, default=0.02, help="Share of repeated rows")
+    parser.add_argument("--standard-headers", action="store_true", help="Use the standard header on every sheet")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_workbook(args.path, args.rows, args.sheets, args.typo_rate, not args.standard_headers,
+                   args.duplicate_rate, args.seed)
+    print(f"Wrote {args.rows} rows over {args.sheets} sheets to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
+import numpy as np
 import pandas as pd
 import re
 import io
+from functools import lru_cache
+
+# Upper bound on remembered raw -> canonical mappings per normalizer.
+# The caches live for the whole process, so repeated uploads reuse them.
+CANONICAL_CACHE_SIZE = 65536
+
+_WHITESPACE_RE = re.compile(r'\s+')
 
 def normalize_text(text):
     """
@@ -28,17 +36,31 @@ COLLEGE_MAPPINGS = {
     "ssn college of engineering": "SSN College of Engineering"
 }
 
-def normalize_college_name(name):
+# Reviewed aliases from college_matching (collapsed lowercase name -> standard name).
+# Consulted after COLLEGE_MAPPINGS; replace them with set_college_aliases().
+COLLEGE_ALIASES = {}
+
+def set_college_aliases(aliases):
+    """
+    Replaces the alias table used by normalize_college_name and empties the
+    canonicalization caches so the new aliases take effect immediately.
+    """
+    COLLEGE_ALIASES.clear()
+    COLLEGE_ALIASES.update({_WHITESPACE_RE.sub(' ', str(k).strip()).lower(): v for k, v in aliases.items()})
+    clear_normalization_cache()
+
+def normalize_college_name(name, use_aliases=True):
     """
     Specific normalization for college names.
-    Uses a mapping dictionary for common typos and abbreviations.
+    Uses a mapping dictionary for common typos and abbreviations,
+    then the reviewed COLLEGE_ALIASES unless use_aliases is False.
     """
     if pd.isna(name) or name == "" or str(name).lower() == 'nan':
         return "Unknown College"
     
     name = str(name).strip()
     # Basic cleanup: remove multiple spaces
-    name = re.sub(r'\s+', ' ', name)
+    name = _WHITESPACE_RE.sub(' ', name)
     
     # Create a normalized key for lookup (lowercase, remove dots for some comparisons if needed)
     # We will try exact lowercase match first
@@ -52,6 +74,10 @@ def normalize_college_name(name):
     no_dots_name = lower_name.replace(".", "")
     if no_dots_name in COLLEGE_MAPPINGS:
         return COLLEGE_MAPPINGS[no_dots_name]
+
+    # Aliases found by fuzzy matching and reviewed by a person
+    if use_aliases and lower_name in COLLEGE_ALIASES:
+        return COLLEGE_ALIASES[lower_name]
         
     # Common replacements (can be expanded based on data)
     name = name.replace("IIT", "Indian Institute of Technology")
@@ -59,14 +85,59 @@ def normalize_college_name(name):
     
     return name.title()
 
+# Memoized variants used for whole columns. typed=True keeps 1 and 1.0 apart,
+# since they normalize to different strings.
+cached_normalize_text = lru_cache(maxsize=CANONICAL_CACHE_SIZE, typed=True)(normalize_text)
+cached_normalize_college_name = lru_cache(maxsize=CANONICAL_CACHE_SIZE, typed=True)(normalize_college_name)
+
+def normalize_column(series, normalizer, categorical=False):
+    """
+    Applies `normalizer` once per distinct value of the series and maps the
+    results back onto every row. Missing values are normalized once as well.
+    With categorical=True the result is a categorical with sorted categories,
+    built straight from the factorized codes.
+    """
+    codes, uniques = pd.factorize(series)
+    if uniques.dtype == object and any(not isinstance(v, str) for v in uniques) and \
+            len({type(v) for v in series.dropna() if not isinstance(v, str)}) > 1:
+        # Mixed numeric types (e.g. 5 and 5.0) hash together but normalize differently
+        result = series.map(normalizer)
+        return result.astype('category') if categorical else result
+    # Slot -1 (missing values) picks up the last entry
+    canonical = [normalizer(value) for value in uniques] + [normalizer(None)]
+    if categorical:
+        canonical_codes, categories = pd.factorize(pd.Series(canonical, dtype=object), sort=True)
+        values = pd.Categorical.from_codes(canonical_codes[codes], categories=categories)
+        return pd.Series(values, index=series.index, name=series.name)
+    return pd.Series(np.asarray(canonical, dtype=object)[codes], index=series.index, name=series.name)
+
+def normalization_cache_info():
+    """
+    Returns hit/miss counters and sizes of the canonicalization caches.
+    """
+    return {
+        "college_name": cached_normalize_college_name.cache_info()._asdict(),
+        "text": cached_normalize_text.cache_info()._asdict()
+    }
+
+def clear_normalization_cache():
+    """
+    Empties the canonicalization caches. Call this after editing COLLEGE_MAPPINGS
+    (set_college_aliases does it for COLLEGE_ALIASES).
+    """
+    cached_normalize_college_name.cache_clear()
+    cached_normalize_text.cache_clear()
+
 def convert_df_to_csv(df):
     """
     Converts a DataFrame to a CSV string for download.
+    For large frames, exporters.iter_csv writes the same text in chunks.
     """
     return df.to_csv(index=False).encode('utf-8')
 
 def convert_df_to_json(df):
     """
     Converts a DataFrame to a JSON string for download.
+    For large frames, exporters.iter_ndjson writes one record per line in chunks.
     """
     return df.to_json(orient="records", indent=2).encode('utf-8')
@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+import openpyxl
+
+import data_processor
+import exporters
+from synthetic_workbook import write_workbook
+
+
+def write_gap_workbook(path):
+    """
+    A workbook with blank All Girls cells, fractional and missing Team Strength
+    values and a Reviewed By column mixing names and numbers.
+    """
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Round 1"
+    sheet.append(data_processor.STANDARD_COLUMNS)
+    sheet.append(["Team A", "IIT Madras", "Tamil Nadu", "Open", 4, "Yes", "Chennai", "Alice"])
+    sheet.append(["Team B", "NIT Trichy", "Tamil Nadu", "Edu Tech", 2.5, None, "Trichy", None])
+    sheet.append(["Team C", "VIT", "Tamil Nadu", "Fin Tech", None, "No", "Vellore", "Bob"])
+    sheet.append(["Team D", "VIT", "Tamil Nadu", "Fin Tech", 3, "TRUE", "Vellore", "Bob"])
+    sheet.append(["Team E", "VIT", "Tamil Nadu", "Edu Tech", 2, "No", "Vellore", 42])
+    workbook.save(path)
+
+
+def exports(df):
+    return "".join(exporters.iter_csv(df)), "".join(exporters.iter_ndjson(df))
+
+
+def compare(path):
+    """
+    Exports of the compact cleaned frame must equal those of the plain one.
+    """
+    sheets_dict, error = data_processor.load_data(path)
+    assert error is None, error
+    merged = data_processor.merge_sheets(sheets_dict)
+    plain = data_processor.clean_data(merged, compact=False)
+    compact = data_processor.clean_data(merged)
+
+    plain_csv, plain_ndjson = exports(plain)
+    compact_csv, compact_ndjson = exports(compact)
+    assert compact_csv == plain_csv, f"{path}: CSV export changed"
+    assert compact_ndjson == plain_ndjson, f"{path}: NDJSON export changed"
+    stats = data_processor.generate_statistics(plain)
+    assert data_processor.generate_statistics(compact) == stats, f"{path}: statistics changed"
+    streamed, error = data_processor.stream_statistics(path)
+    assert error is None, error
+    assert streamed == stats, f"{path}: streamed statistics differ"
+    print(f"{os.path.basename(path)}: {len(compact)} rows, CSV/NDJSON exports and statistics unchanged")
+
+
+def test_exports():
+    print("Comparing exports before and after compact dtypes...")
+    with tempfile.TemporaryDirectory() as tmp:
+        gaps = os.path.join(tmp, "gaps.xlsx")
+        write_gap_workbook(gaps)
+        synthetic = os.path.join(tmp, "synthetic.xlsx")
+        write_workbook(synthetic, 2_000, sheets=3)
+        for path in ["test_data.xlsx", gaps, synthetic]:
+            compare(path)
+    print("Verification PASSED!")
+
+
+if __name__ == "__main__":
+    test_exports()
@@ -0,0 +1,354 @@
+"""
+Fast-path reader for .xlsx workbooks. Instead of letting openpyxl build a cell
+object per cell (the dominant cost of pd.read_excel), the shared-strings table
+and each sheet's XML are streamed with iterparse and the values of the wanted
+columns are collected straight into per-column lists. pandas' own TextParser
+then infers the column dtypes, so the frames equal pd.read_excel's:
+
+    workbook = XlsxWorkbook("registrations.xlsx")
+    df = workbook.parse("Round 1", usecols=lambda name: name in wanted)
+
+Cell values are converted the way openpyxl and pandas convert them (numbers,
+dates, booleans, errors), using openpyxl's public date helpers.
+"""
+import posixpath
+import zipfile
+from xml.etree.ElementTree import XMLPullParser, fromstring, iterparse
+
+import numpy as np
+from openpyxl.styles.stylesheet import Stylesheet
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+from pandas import DataFrame, RangeIndex
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_ROW = MAIN_NS + "row"
+_VALUE = MAIN_NS + "v"
+_INLINE = MAIN_NS + "is"
+_TEXT = MAIN_NS + "t"
+_RUN = MAIN_NS + "r"
+_STRING_ITEM = MAIN_NS + "si"
+
+_DIGITS = "0123456789"
+
+# Column letters -> 0-based index, filled by _column_index
+_COLUMN_INDEXES = {}
+
+# Bytes of sheet XML fed to the parser at a time
+READ_CHUNK_BYTES = 1 << 14
+
+
+def is_xlsx(file):
+    """
+    True when the file is a zip package (xlsx/xlsm). Other formats (xls, ods)
+    are left to pandas.
+    """
+    try:
+        return zipfile.is_zipfile(file)
+    finally:
+        if hasattr(file, "seek"):
+            file.seek(0)
+
+
+def _text_content(node):
+    """
+    The plain text of an <si> or <is> element: its <t> and the <t> of every
+    rich-text run, without phonetic hints (like openpyxl's Text.content).
+    """
+    parts = []
+    for child in node:
+        if child.tag == _TEXT:
+            if child.text:
+                parts.append(child.text)
+        elif child.tag == _RUN:
+            text = child.findtext(_TEXT)
+            if text:
+                parts.append(text)
+    return "".join(parts)
+
+
+def _column_index(ref):
+    """
+    0-based column of a cell reference ("AB12" -> 27).
+    """
+    letters = ref.rstrip(_DIGITS)
+    index = _COLUMN_INDEXES.get(letters)
+    if index is None:
+        index = 0
+        for letter in letters:
+            index = index * 26 + ord(letter) - 64
+        index = _COLUMN_INDEXES[letters] = index - 1
+    return index
+
+
+def _cast_number(value):
+    """
+    A numeric cell's text as int, or as float when it has a fraction or an
+    exponent (as openpyxl reads it).
+    """
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+class XlsxWorkbook:
+    """
+    An .xlsx workbook opened for reading with the same `sheet_names` and
+    `parse(sheet_name, usecols=None)` interface as pd.ExcelFile.
+    """
+
+    def __init__(self, file):
+        self._zip = zipfile.ZipFile(file)
+        self._shared_strings = None
+        self._styles = None
+
+        workbook_path = self._office_document()
+        workbook = fromstring(self._zip.read(workbook_path))
+        properties = workbook.find(MAIN_NS + "workbookPr")
+        date1904 = properties is not None and properties.get("date1904", "").lower() in ("1", "true")
+        self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+        rels = self._relationships(workbook_path)
+        self._sheet_paths = {}
+        for sheet in workbook.iter(MAIN_NS + "sheet"):
+            rel_id = sheet.get(REL_NS + "id")
+            if rel_id in rels:
+                self._sheet_paths[sheet.get("name")] = rels[rel_id][1]
+        self.sheet_names = list(self._sheet_paths)
+        self._strings_path = next((target for kind, target in rels.values() if kind.endswith("/sharedStrings")), None)
+        self._styles_path = next((target for kind, target in rels.values() if kind.endswith("/styles")), None)
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _office_document(self):
+        root = fromstring(self._zip.read("_rels/.rels"))
+        for rel in root.iter(PACKAGE_REL_NS + "Relationship"):
+            if rel.get("Type", "").endswith("/officeDocument"):
+                return rel.get("Target").lstrip("/")
+        return "xl/workbook.xml"
+
+    def _relationships(self, part):
+        """
+        {relationship id: (type, archive path)} of one package part.
+        """
+        folder, name = posixpath.split(part)
+        rels_path = posixpath.join(folder, "_rels", name + ".rels")
+        if rels_path not in self._zip.namelist():
+            return {}
+        rels = {}
+        for rel in fromstring(self._zip.read(rels_path)).iter(PACKAGE_REL_NS + "Relationship"):
+            target = rel.get("Target")
+            path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(folder, target))
+            rels[rel.get("Id")] = (rel.get("Type", ""), path)
+        return rels
+
+    @property
+    def shared_strings(self):
+        """
+        The shared-strings table, streamed once on first use.
+        """
+        if self._shared_strings is None:
+            strings = []
+            if self._strings_path in self._zip.namelist():
+                with self._zip.open(self._strings_path) as f:
+                    for _, node in iterparse(f):
+                        if node.tag == _STRING_ITEM:
+                            strings.append(_text_content(node).replace("x005F_", ""))
+                            node.clear()
+            self._shared_strings = strings
+        return self._shared_strings
+
+    @property
+    def date_styles(self):
+        """
+        (style ids with a date format, style ids with a duration format).
+        """
+        if self._styles is None:
+            if self._styles_path in self._zip.namelist():
+                stylesheet = Stylesheet.from_tree(fromstring(self._zip.read(self._styles_path)))
+                self._styles = (stylesheet.date_formats, stylesheet.timedelta_formats)
+            else:
+                self._styles = (set(), set())
+        return self._styles
+
+    def _cell_value(self, cell):
+        """
+        A cell's value as pd.read_excel sees it: "" when empty, NaN for errors,
+        integral numbers as int.
+        """
+        kind = cell.get("t", "n")
+        if kind == "inlineStr":
+            node = cell.find(_INLINE)
+            return "" if node is None else _text_content(node)
+        value = cell.findtext(_VALUE)
+        if not value:
+            return ""
+        if kind == "n":
+            value = _cast_number(value)
+            style = cell.get("s")
+            date_formats, timedelta_formats = self.date_styles
+            if style and int(style) in date_formats:
+                try:
+                    return from_excel(value, self.epoch, timedelta=int(style) in timedelta_formats)
+                except (OverflowError, ValueError):
+                    return np.nan
+        elif kind == "s":
+            return self.shared_strings[int(value)]
+        elif kind == "str":
+            return value
+        elif kind == "b":
+            return bool(int(value))
+        elif kind == "e":
+            return np.nan
+        elif kind == "d":
+            return from_ISO8601(value)
+        else:
+            return value
+        integral = int(value)
+        return integral if integral == value else float(value)
+
+    def _sheet_rows(self, sheet_name):
+        """
+        Yields the <row> elements of a sheet as the XML streams in. Each element
+        is cleared once the next one is requested.
+        """
+        with self._zip.open(self._sheet_paths[sheet_name]) as f:
+            parser = XMLPullParser(("end",))
+            while True:
+                chunk = f.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                for _, node in parser.read_events():
+                    if node.tag == _ROW:
+                        yield node
+                        node.clear()
+            parser.close()
+
+    def parse(self, sheet_name, usecols=None):
+        """
+        Reads one sheet into a DataFrame equal to pd.read_excel(file, sheet_name,
+        usecols=usecols): first row as header, trailing blank rows dropped.
+        `usecols` is None or a callable taking a column name; only the columns
+        it accepts are collected, the others are still scanned to tell blank
+        rows from data. A sheet without any accepted column keeps its rows.
+        """
+        if sheet_name not in self._sheet_paths:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+        header = []
+        slots = None        # wanted column -> position in each row list, set once the header is known
+        read_all = usecols is None
+        rows = []           # wanted values of every data row read so far (gaps included)
+        last_data_row = 0   # data rows up to the last one that has a value
+        width = 0           # widest row, as pd.read_excel pads every row to it
+        cell_value = self._cell_value
+        row_number = 0
+
+        for node in self._sheet_rows(sheet_name):
+            number = node.get("r")
+            row_number = int(number) if number else row_number + 1
+            if row_number == 1:
+                column = -1
+                for cell in node:
+                    ref = cell.get("r")
+                    column = _column_index(ref) if ref else column + 1
+                    header.extend([""] * (column + 1 - len(header)))
+                    header[column] = cell_value(cell)
+                continue
+            if slots is None:
+                slots = {column: slot for slot, column in enumerate(self._wanted_columns(header, usecols))}
+
+            # Rows missing from the XML are blank rows
+            while len(rows) < row_number - 2:
+                rows.append([""] * len(slots))
+
+            values = [""] * len(slots)
+            has_data = False
+            column = -1
+            for cell in node:
+                ref = cell.get("r")
+                column = _column_index(ref) if ref else column + 1
+                slot = slots.get(column)
+                if slot is None and read_all:
+                    # A column past the header
+                    slot = slots[column] = len(slots)
+                    values.append("")
+                if slot is not None:
+                    value = values[slot] = cell_value(cell)
+                elif has_data and column < width:
+                    continue
+                else:
+                    value = cell_value(cell)
+                if value.__class__ is not str or value:
+                    has_data = True
+                    if column >= width:
+                        width = column + 1
+            rows.append(values)
+            if has_data:
+                last_data_row = len(rows)
+
+        if slots is None:
+            slots = {column: slot for slot, column in enumerate(self._wanted_columns(header, usecols))}
+        header_width = len(header)
+        while header_width and header[header_width - 1] == "":
+            header_width -= 1
+        return self._frame(header[:header_width], slots, rows[:last_data_row], max(width, header_width), usecols)
+
+    def _wanted_columns(self, header, usecols):
+        """
+        Positions of the header cells that usecols accepts (all when it is None).
+        Widths past the header are only known at the end, and their
+        "Unnamed: i" columns are never mapped, so they are only read without usecols.
+        """
+        if usecols is None:
+            return list(range(len(header)))
+        return [column for column, name in enumerate(self._header_names(header, len(header))) if usecols(name)]
+
+    @staticmethod
+    def _header_names(header, width):
+        """
+        Column names as pd.read_excel derives them from the header row
+        ("Unnamed: i" for blanks, ".1" suffixes for repeats).
+        """
+        if width == 0:
+            return []
+        row = list(header) + [""] * (width - len(header))
+        return list(TextParser([row], header=0, skip_blank_lines=False).read().columns)
+
+    def _frame(self, header, slots, rows, width, usecols):
+        if width == 0 and not rows:
+            # pd.read_excel gives an empty frame for an empty sheet
+            return DataFrame()
+        names = self._header_names(header, width)
+        if usecols is None:
+            # Columns past the header that only ever held blanks
+            for column in range(width):
+                slots.setdefault(column, len(slots))
+        selected = sorted(column for column in slots if column < width and (usecols is None or usecols(names[column])))
+        if not rows:
+            return DataFrame(columns=[names[column] for column in selected])
+        if not selected:
+            # Unlike pd.read_excel, the rows are kept when usecols rejects every column
+            return DataFrame(index=RangeIndex(len(rows)))
+        for row in rows:
+            # Rows read before a column past the header appeared are shorter
+            row.extend([""] * (len(slots) - len(row)))
+        order = [slots[column] for column in selected]
+        data = rows if order == list(range(len(slots))) else [[row[slot] for slot in order] for row in rows]
+        try:
+            return TextParser(data, names=[names[column] for column in selected], header=None,
+                              skip_blank_lines=False).read()
+        except EmptyDataError:
+            return DataFrame()